@@ -14,20 +14,19 @@ def export_dfa_html(out_path: str = "exports/afd.html") -> Tuple[bool, str]:
 
         # Obtener el DFA minimizado
         dfa = build_min_dfa()
-        if not dfa or not hasattr(dfa, 'state_list') or not hasattr(dfa, 'trans'):
+        if not dfa or not hasattr(dfa, 'accepts') or not hasattr(dfa, 'table'):
             return False, "Error: DFA no válido o mal formado"
 
         # Extraer información del DFA
-        n_states = len(dfa.state_list)
+        n_states = len(dfa.accepts)
         accepting = []
         alphabet = set()
 
         # Recopilar estados de aceptación y alfabeto de forma segura
-        for i, state in enumerate(dfa.state_list):
-            if hasattr(state, 'accepts') and state.accepts:
+        for i, accepts in enumerate(dfa.accepts):
+            if accepts:
                 accepting.append(f"S{i}")
-            if i in dfa.trans:
-                alphabet.update(dfa.trans[i].keys())
+            alphabet.update(dfa.transitions(i).keys())
 
         alphabet = sorted(alphabet)
 
@@ -97,13 +96,13 @@ def export_dfa_html(out_path: str = "exports/afd.html") -> Tuple[bool, str]:
         html_content += "</tr>"
 
         for s in range(n_states):
-            cls = "accept" if dfa.state_list[s].accepts else ""
+            cls = "accept" if dfa.accept_mask >> s & 1 else ""
             row = f"<tr><td class='{cls}'>S{s}</td>"
             
             for a in alphabet:
-                # Manejar transiciones de forma segura
-                dest = dfa.trans.get(s, {}).get(a, None)
-                cell_content = f"S{dest}" if dest is not None else "—"
+                # Leer la transición de la tabla densa (-1 = sin transición)
+                dest = dfa.step(s, a)
+                cell_content = f"S{dest}" if dest >= 0 else "—"
                 row += f"<td>{cell_content}</td>"
             
             row += "</tr>"
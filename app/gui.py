@@ -1,27 +1,114 @@
 import os
+from html import escape as _html_escape
+from pathlib import Path
 from PyQt6 import QtWidgets, QtGui, QtCore
 from .lexer import Lexer, LexError
 from .parser import Parser, ParseError
-from .semantic_analyzer import SemanticAnalyzer
 from .ast_nodes import ast_to_string, ASTNode, FunctionDecl, Block, IfStmt, WhileStmt, ForStmt, Program
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from .automata_generator import AutomataGenerator, LexerAutomata
 from typing import Optional
 
 
+# Hojas de estilo (QSS), definidas una sola vez a nivel de módulo
+_MAIN_QSS = """
+    QMainWindow { background-color: #1e1e1e; color: #e0e0e0; }
+    QPlainTextEdit {
+        background-color: #252526; color: #ffffff;
+        border: 1px solid #3c3c3c; border-radius: 6px;
+        font-family: 'Consolas'; font-size: 11pt;
+    }
+    QPushButton {
+        background-color: #007acc; color: white;
+        border-radius: 6px; padding: 6px 12px;
+    }
+    QPushButton:hover { background-color: #0095ff; }
+    QTableView {
+        background-color: #1e1e1e; color: white;
+        selection-background-color: #007acc;
+        border-radius: 6px;
+    }
+    QMessageBox { background-color: #1e1e1e; color: white; }
+"""
+
+_COMBO_QSS = """
+    QComboBox {
+        background-color: #2d2d2d;
+        color: white;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+        padding: 5px 10px;
+        min-width: 150px;
+    }
+    QComboBox:hover {
+        background-color: #3c3c3c;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+    QComboBox::down-arrow {
+        image: url(down_arrow.png);
+        width: 12px;
+        height: 12px;
+    }
+    QComboBox QAbstractItemView {
+        background-color: #2d2d2d;
+        color: white;
+        selection-background-color: #007acc;
+    }
+"""
+
+_TABS_QSS = """
+    QTabWidget::pane {
+        border: 1px solid #3c3c3c;
+        background-color: #1e1e1e;
+    }
+    QTabBar::tab {
+        background-color: #2d2d2d;
+        color: #ffffff;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: #007acc;
+    }
+    QTabBar::tab:hover {
+        background-color: #3c3c3c;
+    }
+"""
+
+# Compartida por las vistas de solo lectura del AST y del análisis semántico
+_CODE_VIEW_QSS = """
+    QPlainTextEdit {
+        background-color: #252526;
+        color: #ffffff;
+        border: 1px solid #3c3c3c;
+        font-family: 'Consolas';
+        font-size: 10pt;
+    }
+"""
+
+_AUTOMATA_QSS = """
+    QLabel {
+        background-color: white;
+        border: 2px solid #3c3c3c;
+        border-radius: 6px;
+    }
+"""
+
+
 class TokenTableModel(QtCore.QAbstractTableModel):
     HEADERS = ["LINE", "COL", "TOKEN", "LEXEME"]
 
     def __init__(self, tokens):
         super().__init__()
         self.tokens = tokens
+        # Celdas materializadas una sola vez: data() se llama por celda, rol y repintado
+        self._cells = [(t.line, t.col, t.type, t.lexeme) for t in tokens]
+        self._n = len(self._cells)
+        self._font = QtGui.QFont("Consolas")
 
     def rowCount(self, parent=None):
-        return len(self.tokens)
+        return self._n
 
     def columnCount(self, parent=None):
         return 4
@@ -29,11 +116,10 @@ class TokenTableModel(QtCore.QAbstractTableModel):
     def data(self, index, role):
         if not index.isValid():
             return None
-        t = self.tokens[index.row()]
         if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            return [t.line, t.col, t.type, t.lexeme][index.column()]
+            return self._cells[index.row()][index.column()]
         if role == QtCore.Qt.ItemDataRole.FontRole and index.column() == 3:
-            return QtGui.QFont("Consolas")
+            return self._font
         return None
 
     def headerData(self, section, orientation, role):
@@ -44,30 +130,66 @@ class TokenTableModel(QtCore.QAbstractTableModel):
         return section + 1
 
 
+class PdfWorker(QtCore.QObject):
+    """Construye el PDF (doc.build) en un hilo aparte para no bloquear la interfaz"""
+    finished = QtCore.pyqtSignal(str)
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, doc, elements):
+        super().__init__()
+        self.doc = doc
+        self.elements = elements
+
+    def run(self):
+        try:
+            self.doc.build(self.elements)
+        except Exception as e:
+            self.error.emit(str(e))
+        else:
+            self.finished.emit(self.doc.filename)
+
+
+class _JobSignals(QtCore.QObject):
+    done = QtCore.pyqtSignal(object)
+
+
+class AnalysisJob(QtCore.QRunnable):
+    """Ejecuta una fase del análisis (léxico, sintáctico o semántico) en el pool de hilos"""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _JobSignals()
+
+    def run(self):
+        try:
+            result = (True, self.fn())
+        except Exception as e:
+            result = (False, e)
+        self.signals.done.emit(result)
+
+
 class MainWindow(QtWidgets.QMainWindow):
+    # Nombre de archivo por defecto según el tipo de exportación
+    _DEFAULT_PDF_NAMES = {
+        "Tokens a PDF": "tokens.pdf",
+        "AST a PDF": "ast.pdf",
+        "Semántico a PDF": "analisis_semantico.pdf",
+        "Autómata a PDF": "automata.pdf",
+        "Todo a PDF": "analisis_completo.pdf"
+    }
+
+    # Bloques preformateados del PDF: el marco mide 540pt y cada carácter de
+    # Courier 9 ocupa 5.4pt (100 columnas); las líneas más largas se cortan y
+    # la continuación se sangra
+    _PDF_CODE_COLUMNS = 96
+    _PDF_CODE_CONTINUATION = "    "
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Analizador Léxico LL(1)")
         self.resize(1000, 700)
-        self.setStyleSheet("""
-            QMainWindow { background-color: #1e1e1e; color: #e0e0e0; }
-            QPlainTextEdit {
-                background-color: #252526; color: #ffffff;
-                border: 1px solid #3c3c3c; border-radius: 6px;
-                font-family: 'Consolas'; font-size: 11pt;
-            }
-            QPushButton {
-                background-color: #007acc; color: white;
-                border-radius: 6px; padding: 6px 12px;
-            }
-            QPushButton:hover { background-color: #0095ff; }
-            QTableView {
-                background-color: #1e1e1e; color: white;
-                selection-background-color: #007acc;
-                border-radius: 6px;
-            }
-            QMessageBox { background-color: #1e1e1e; color: white; }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
 
         # --- Layout principal ---
         central = QtWidgets.QWidget()
@@ -109,32 +231,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.export_combo = QtWidgets.QComboBox()
         self.export_combo.addItems(["Tokens a PDF", "AST a PDF", "Semántico a PDF", "Autómata a PDF", "Todo a PDF"])
-        self.export_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #2d2d2d;
-                color: white;
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-                padding: 5px 10px;
-                min-width: 150px;
-            }
-            QComboBox:hover {
-                background-color: #3c3c3c;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: url(down_arrow.png);
-                width: 12px;
-                height: 12px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2d2d2d;
-                color: white;
-                selection-background-color: #007acc;
-            }
-        """)
+        self.export_combo.setStyleSheet(_COMBO_QSS)
         buttons.addWidget(self.export_combo)
 
         self.btn_export = QtWidgets.QPushButton("📄 Exportar")
@@ -150,68 +247,34 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # --- Área de salida con tabs ---
         self.tabs = QtWidgets.QTabWidget()
-        self.tabs.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #3c3c3c;
-                background-color: #1e1e1e;
-            }
-            QTabBar::tab {
-                background-color: #2d2d2d;
-                color: #ffffff;
-                padding: 8px 16px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: #007acc;
-            }
-            QTabBar::tab:hover {
-                background-color: #3c3c3c;
-            }
-        """)
+        self.tabs.setStyleSheet(_TABS_QSS)
 
         # --- Tabla de tokens ---
         self.table = QtWidgets.QTableView()
+        # Filas de alto fijo y ajuste de columnas sobre una muestra de filas:
+        # Qt no consulta data() de todos los tokens para medir
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setResizeContentsPrecision(200)
         self.tabs.addTab(self.table, "Tokens")
 
         # --- Visualización del AST ---
         self.ast_view = QtWidgets.QPlainTextEdit()
         self.ast_view.setReadOnly(True)
-        self.ast_view.setStyleSheet("""
-            QPlainTextEdit {
-                background-color: #252526;
-                color: #ffffff;
-                border: 1px solid #3c3c3c;
-                font-family: 'Consolas';
-                font-size: 10pt;
-            }
-        """)
+        self.ast_view.setStyleSheet(_CODE_VIEW_QSS)
         self.tabs.addTab(self.ast_view, "AST")
 
         # --- Visualización del análisis semántico ---
         self.semantic_view = QtWidgets.QPlainTextEdit()
         self.semantic_view.setReadOnly(True)
-        self.semantic_view.setStyleSheet("""
-            QPlainTextEdit {
-                background-color: #252526;
-                color: #ffffff;
-                border: 1px solid #3c3c3c;
-                font-family: 'Consolas';
-                font-size: 10pt;
-            }
-        """)
+        self.semantic_view.setStyleSheet(_CODE_VIEW_QSS)
         self.tabs.addTab(self.semantic_view, "Análisis Semántico")
 
         # --- Visualización del autómata ---
         self.automata_scroll = QtWidgets.QScrollArea()
         self.automata_view = QtWidgets.QLabel()
         self.automata_view.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.automata_view.setStyleSheet("""
-                  QLabel {
-                      background-color: white;
-                      border: 2px solid #3c3c3c;
-                      border-radius: 6px;
-                  }
-              """)
+        self.automata_view.setStyleSheet(_AUTOMATA_QSS)
         self.automata_view.setMinimumSize(400, 300)  # Tamaño mínimo
         self.automata_scroll.setWidget(self.automata_view)
         self.automata_scroll.setWidgetResizable(True)  # Permitir redimensionar el contenido
@@ -237,7 +300,20 @@ class MainWindow(QtWidgets.QMainWindow):
         # Variables para almacenar resultados
         self.current_tokens = None
         self.current_ast = None
+        # Copia del texto mostrado en las vistas de solo lectura AST/semántico:
+        # las exportaciones la reutilizan en vez de volver a leer el documento Qt
+        self._ast_str_cache = ""
+        self._semantic_report_cache = ""
         self.automata_generator = AutomataGenerator()
+        self._pdf_thread = None
+        self._pdf_worker = None
+        self._job = None
+        self._exports_dir = Path.cwd() / "exports"
+        # Memoización por fase: código que produjo los tokens, tokens que
+        # produjeron el AST y AST ya analizado semánticamente
+        self._tokens_src = None
+        self._ast_tokens = None
+        self._semantic_ast = None
 
     # ------------------------------------------------------------------
     # Abrir archivo fuente
@@ -249,76 +325,158 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             if not path:
                 return
-            with open(path, "r", encoding="utf-8") as f:
-                self.editor.setPlainText(f.read())
+            # Lectura del archivo completo de una vez
+            self.editor.setPlainText(Path(path).read_text(encoding="utf-8"))
             self.status.showMessage(f"Archivo cargado: {os.path.basename(path)}", 4000)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"No se pudo abrir el archivo:\n{e}")
 
+    # ------------------------------------------------------------------
+    # Ejecución de las fases de análisis en segundo plano
+    # ------------------------------------------------------------------
+    def _run_job(self, fn, on_done, on_error, message):
+        """Ejecuta fn en el QThreadPool; on_done/on_error corren luego en el hilo de la interfaz"""
+        job = AnalysisJob(fn)
+        job.signals.done.connect(self._on_job_done)
+        self._job = (job, on_done, on_error)
+        self._set_analysis_enabled(False)
+        self.status.showMessage(message)
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _on_job_done(self, result):
+        _, on_done, on_error = self._job
+        self._job = None
+        self._set_analysis_enabled(True)
+        self.status.clearMessage()
+        ok, value = result
+        if ok:
+            on_done(value)
+        else:
+            on_error(value)
+
+    def _set_analysis_enabled(self, enabled):
+        for btn in (self.btn_token, self.btn_parse, self.btn_semantic, self.btn_automata, self.btn_clear):
+            btn.setEnabled(enabled)
+
     # ------------------------------------------------------------------
     # Tokenizar texto
     # ------------------------------------------------------------------
     def on_tokenize(self):
+        self._run_tokenize()
+
+    def _run_tokenize(self, then=None):
+        # then: continuación a ejecutar cuando los tokens estén listos
         src = self.editor.toPlainText()
-        lex = Lexer(src)
-        try:
-            tokens = lex.tokenize()
-            self.current_tokens = tokens  # Guardar para el parser
-        except LexError as e:
-            QtWidgets.QMessageBox.critical(
-                self, "Error léxico",
-                f"Línea {e.line}, Columna {e.col}\nLexema: {e.lexeme}"
-            )
-            return
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error inesperado", str(e))
+        if self.current_tokens and src == self._tokens_src:
+            # Mismo código que produjo los tokens actuales: se reutilizan
+            self.tabs.setCurrentIndex(0)
+            self.status.showMessage(f"{len(self.current_tokens)} tokens (código sin cambios)", 4000)
+            if then:
+                then()
             return
 
+        self._run_job(
+            lambda: Lexer(src).tokenize(),
+            lambda tokens: self._show_tokens(tokens, then, src),
+            self._show_lex_error,
+            "Tokenizando..."
+        )
+
+    def _show_tokens(self, tokens, then=None, src=None):
+        self.current_tokens = tokens  # Guardar para el parser
+        self._tokens_src = src
+
+        # Sin repintados intermedios: el modelo y el ajuste de columnas se
+        # aplican de una vez y la vista se dibuja una sola vez al final
         model = TokenTableModel(tokens)
+        self.table.setUpdatesEnabled(False)
+        # setModel crea un QItemSelectionModel nuevo (hijo de la vista) y no
+        # destruye el anterior: se libera a mano para no acumular uno por corrida
+        old_selection = self.table.selectionModel()
         self.table.setModel(model)
+        if old_selection is not None:
+            old_selection.deleteLater()
         self.table.resizeColumnsToContents()
+        self.table.setUpdatesEnabled(True)
         self.tabs.setCurrentIndex(0)  # Mostrar tab de tokens
         self.status.showMessage(f"{len(tokens)} tokens generados", 4000)
 
+        if then:
+            then()
+
+    def _show_lex_error(self, e):
+        if isinstance(e, LexError):
+            QtWidgets.QMessageBox.critical(
+                self, "Error léxico",
+                f"Línea {e.line}, Columna {e.col}\nLexema: {e.lexeme}"
+            )
+        else:
+            QtWidgets.QMessageBox.critical(self, "Error inesperado", str(e))
+
     # ------------------------------------------------------------------
     # Analizar sintácticamente
     # ------------------------------------------------------------------
     def on_parse(self):
-        # Primero tokenizar si no hay tokens
-        if not self.current_tokens:
-            self.on_tokenize()
-            if not self.current_tokens:
-                return
+        self._run_parse()
 
-        try:
-            parser = Parser(self.current_tokens)
-            ast = parser.parse()
-            self.current_ast = ast  # Guardar para el análisis semántico
+    def _run_parse(self, then=None):
+        # Primero tokenizar si no hay tokens o el código cambió desde entonces
+        if not self.current_tokens or self.editor.toPlainText() != self._tokens_src:
+            self._run_tokenize(then=lambda: self._run_parse(then))
+            return
+
+        tokens = self.current_tokens
+        if self.current_ast is not None and self._ast_tokens is tokens:
+            # AST ya construido a partir de estos mismos tokens
+            self.tabs.setCurrentIndex(1)
+            self.status.showMessage("AST sin cambios", 4000)
+            if then:
+                then()
+            return
 
+        def parse():
+            ast = Parser(tokens).parse()
             # Convertir AST a string para visualización
-            ast_str = ast_to_string(ast)
-            self.ast_view.setPlainText(ast_str)
-            self.tabs.setCurrentIndex(1)  # Mostrar tab de AST
+            return ast, ast_to_string(ast)
 
-            self.status.showMessage("Análisis sintáctico completado exitosamente", 4000)
-            QtWidgets.QMessageBox.information(
-                self,
-                "Análisis Sintáctico",
-                "El código fuente es sintácticamente correcto.\n"
-                "El árbol de sintaxis abstracta (AST) se muestra en la pestaña AST."
-            )
+        self._run_job(
+            parse,
+            lambda result: self._show_ast(*result, then, tokens),
+            self._show_parse_error,
+            "Analizando sintaxis..."
+        )
 
-        except ParseError as e:
-            self.current_ast = None
-            self.ast_view.setPlainText(f"ERROR DE SINTAXIS:\n\n{str(e)}")
+    def _show_ast(self, ast, ast_str, then=None, tokens=None):
+        self.current_ast = ast  # Guardar para el análisis semántico
+        self._ast_tokens = tokens
+        self._ast_str_cache = ast_str
+        self.ast_view.setPlainText(ast_str)
+        self.tabs.setCurrentIndex(1)  # Mostrar tab de AST
+
+        self.status.showMessage("Análisis sintáctico completado exitosamente", 4000)
+        QtWidgets.QMessageBox.information(
+            self,
+            "Análisis Sintáctico",
+            "El código fuente es sintácticamente correcto.\n"
+            "El árbol de sintaxis abstracta (AST) se muestra en la pestaña AST."
+        )
+
+        if then:
+            then()
+
+    def _show_parse_error(self, e):
+        self.current_ast = None
+        if isinstance(e, ParseError):
+            self._ast_str_cache = f"ERROR DE SINTAXIS:\n\n{str(e)}"
+            self.ast_view.setPlainText(self._ast_str_cache)
             self.tabs.setCurrentIndex(1)
             QtWidgets.QMessageBox.critical(
                 self, "Error Sintáctico",
                 str(e)
             )
-        except Exception as e:
-            self.current_ast = None
-            self.ast_view.setPlainText(f"ERROR INESPERADO:\n\n{str(e)}")
+        else:
+            self._ast_str_cache = f"ERROR INESPERADO:\n\n{str(e)}"
+            self.ast_view.setPlainText(self._ast_str_cache)
             self.tabs.setCurrentIndex(1)
             QtWidgets.QMessageBox.critical(self, "Error inesperado", str(e))
 
@@ -326,52 +484,73 @@ class MainWindow(QtWidgets.QMainWindow):
     # Análisis semántico
     # ------------------------------------------------------------------
     def on_semantic(self):
-        # Primero hacer parsing si no hay AST
-        if not self.current_ast:
-            self.on_parse()
-            if not self.current_ast:
-                return
+        # Primero hacer parsing si no hay AST o si ya no corresponde al código
+        if (not self.current_ast or self._ast_tokens is not self.current_tokens
+                or self.editor.toPlainText() != self._tokens_src):
+            self._run_parse(then=self.on_semantic)
+            return
+
+        ast = self.current_ast
+        if self._semantic_ast is ast:
+            # Este AST ya fue analizado: el reporte mostrado sigue vigente
+            self.tabs.setCurrentIndex(2)
+            self.status.showMessage("Análisis semántico sin cambios", 4000)
+            return
+
+        def analyze():
+            # Importación diferida: solo se carga al usar el análisis semántico
+            from .semantic_analyzer import SemanticAnalyzer
 
-        try:
             analyzer = SemanticAnalyzer()
-            success = analyzer.analyze(self.current_ast)
-
-            # Mostrar reporte
-            report = analyzer.get_report()
-            self.semantic_view.setPlainText(report)
-            self.tabs.setCurrentIndex(2)  # Mostrar tab de análisis semántico
-
-            if success and not analyzer.warnings:
-                self.status.showMessage("Análisis semántico completado sin errores ni warnings", 4000)
-                QtWidgets.QMessageBox.information(
-                    self,
-                    "Análisis Semántico",
-                    "✅ El código es semánticamente correcto.\n"
-                    "No se encontraron errores ni advertencias."
-                )
-            elif success:
-                self.status.showMessage(f"Análisis semántico completado con {len(analyzer.warnings)} advertencias",
-                                        4000)
-                QtWidgets.QMessageBox.warning(
-                    self,
-                    "Análisis Semántico",
-                    f"⚠️  El código es válido pero tiene {len(analyzer.warnings)} advertencias.\n"
-                    "Revisa la pestaña 'Análisis Semántico' para más detalles."
-                )
-            else:
-                self.status.showMessage(f"Análisis semántico completado con {len(analyzer.errors)} errores", 4000)
-                QtWidgets.QMessageBox.critical(
-                    self,
-                    "Errores Semánticos",
-                    f"❌ Se encontraron {len(analyzer.errors)} errores semánticos.\n"
-                    "Revisa la pestaña 'Análisis Semántico' para más detalles."
-                )
+            success = analyzer.analyze(ast)
+            return analyzer, success, analyzer.get_report()
+
+        self._run_job(
+            analyze,
+            lambda result: self._show_semantic(*result, ast),
+            self._show_semantic_error,
+            "Analizando semántica..."
+        )
 
-        except Exception as e:
-            error_msg = f"ERROR EN ANÁLISIS SEMÁNTICO:\n\n{str(e)}"
-            self.semantic_view.setPlainText(error_msg)
-            self.tabs.setCurrentIndex(2)
-            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+    def _show_semantic(self, analyzer, success, report, ast=None):
+        self._semantic_ast = ast
+        # Mostrar reporte
+        self._semantic_report_cache = report
+        self.semantic_view.setPlainText(report)
+        self.tabs.setCurrentIndex(2)  # Mostrar tab de análisis semántico
+
+        if success and not analyzer.warnings:
+            self.status.showMessage("Análisis semántico completado sin errores ni warnings", 4000)
+            QtWidgets.QMessageBox.information(
+                self,
+                "Análisis Semántico",
+                "✅ El código es semánticamente correcto.\n"
+                "No se encontraron errores ni advertencias."
+            )
+        elif success:
+            self.status.showMessage(f"Análisis semántico completado con {len(analyzer.warnings)} advertencias",
+                                    4000)
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Análisis Semántico",
+                f"⚠️  El código es válido pero tiene {len(analyzer.warnings)} advertencias.\n"
+                "Revisa la pestaña 'Análisis Semántico' para más detalles."
+            )
+        else:
+            self.status.showMessage(f"Análisis semántico completado con {len(analyzer.errors)} errores", 4000)
+            QtWidgets.QMessageBox.critical(
+                self,
+                "Errores Semánticos",
+                f"❌ Se encontraron {len(analyzer.errors)} errores semánticos.\n"
+                "Revisa la pestaña 'Análisis Semántico' para más detalles."
+            )
+
+    def _show_semantic_error(self, e):
+        error_msg = f"ERROR EN ANÁLISIS SEMÁNTICO:\n\n{str(e)}"
+        self._semantic_report_cache = error_msg
+        self.semantic_view.setPlainText(error_msg)
+        self.tabs.setCurrentIndex(2)
+        QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
     # ------------------------------------------------------------------
     # Generar autómata (modificado)
@@ -525,13 +704,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.automata_view.clear()
         self.current_tokens = None
         self.current_ast = None
+        self._ast_str_cache = ""
+        self._semantic_report_cache = ""
+        self._tokens_src = None
+        self._ast_tokens = None
+        self._semantic_ast = None
         # Limpiar variables del autómata
         if hasattr(self, 'current_automata_path'):
             self.current_automata_path = None
         if hasattr(self, 'current_automata_type'):
             self.current_automata_type = None
         if self.table.model():
+            old_selection = self.table.selectionModel()
             self.table.setModel(None)
+            if old_selection is not None:
+                old_selection.deleteLater()
         self.status.showMessage("Todo limpiado", 2000)
 
     # ------------------------------------------------------------------
@@ -555,7 +742,7 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             return
 
-        if "Semántico" in export_type and self.semantic_view.toPlainText().strip() == "":
+        if "Semántico" in export_type and not self._semantic_report_cache:
             QtWidgets.QMessageBox.warning(
                 self, "Advertencia",
                 "No hay análisis semántico para exportar. Primero ejecuta el análisis semántico."
@@ -569,20 +756,11 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             return
 
-        # Determinar nombre de archivo por defecto
-        default_names = {
-            "Tokens a PDF": "tokens.pdf",
-            "AST a PDF": "ast.pdf",
-            "Semántico a PDF": "analisis_semantico.pdf",
-            "Autómata a PDF": "automata.pdf",
-            "Todo a PDF": "analisis_completo.pdf"
-        }
-
         try:
             file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
                 self,
                 "Guardar PDF",
-                os.path.join(os.getcwd(), "exports", default_names.get(export_type, "export.pdf")),
+                str(self._exports_dir / self._DEFAULT_PDF_NAMES.get(export_type, "export.pdf")),
                 "Archivos PDF (*.pdf)"
             )
 
@@ -593,7 +771,12 @@ class MainWindow(QtWidgets.QMainWindow):
                 file_path += '.pdf'
 
             # Asegurar que existe el directorio
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # ReportLab se importa al exportar, no al arrancar la interfaz
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate
 
             # Crear el documento PDF
             doc = SimpleDocTemplate(
@@ -606,26 +789,9 @@ class MainWindow(QtWidgets.QMainWindow):
             )
 
             elements = []
-            styles = getSampleStyleSheet()
-
-            # Estilo para títulos
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#007acc'),
-                spaceAfter=30,
-                alignment=1
-            )
-
-            subtitle_style = ParagraphStyle(
-                'CustomSubtitle',
-                parent=styles['Heading2'],
-                fontSize=16,
-                textColor=colors.HexColor('#007acc'),
-                spaceAfter=20,
-                spaceBefore=20
-            )
+            styles = self._pdf_styles()
+            title_style = styles["title"]
+            subtitle_style = styles["subtitle"]
 
             # Exportar según el tipo seleccionado
             if export_type == "Tokens a PDF":
@@ -639,14 +805,9 @@ class MainWindow(QtWidgets.QMainWindow):
             elif export_type == "Todo a PDF":
                 elements.extend(self._export_all(title_style, subtitle_style))
 
-            # Construir el PDF
-            doc.build(elements)
-
-            self.status.showMessage(f"PDF exportado: {os.path.basename(file_path)}", 4000)
-            QtWidgets.QMessageBox.information(
-                self, "Éxito",
-                f"Archivo exportado exitosamente:\n{file_path}"
-            )
+            # Construir el PDF en segundo plano; los elementos ya se leyeron de
+            # los widgets en este hilo, el worker no toca la interfaz
+            self._start_pdf_worker(doc, elements)
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(
@@ -654,24 +815,115 @@ class MainWindow(QtWidgets.QMainWindow):
                 f"No se pudo exportar el PDF:\n{str(e)}"
             )
 
+    def _start_pdf_worker(self, doc, elements):
+        self._release_pdf_thread()
+        thread = QtCore.QThread()
+        worker = PdfWorker(doc, elements)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_pdf_finished)
+        worker.error.connect(self._on_pdf_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+
+        # Python es el único dueño del hilo y del worker (sin padre Qt ni
+        # deleteLater): las referencias se sueltan solo tras thread.wait()
+        self._pdf_thread, self._pdf_worker = thread, worker
+        self.btn_export.setEnabled(False)
+        self.status.showMessage("Generando PDF...")
+        thread.start()
+
+    def _release_pdf_thread(self):
+        """Espera al hilo del PDF anterior, si lo hay, y libera hilo y worker"""
+        if self._pdf_thread is not None:
+            self._pdf_thread.wait()
+            self._pdf_thread = None
+            self._pdf_worker = None
+
+    def closeEvent(self, event):
+        # No destruir la ventana con un PDF a medio escribir
+        self._release_pdf_thread()
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        super().closeEvent(event)
+
+    def _on_pdf_finished(self, file_path):
+        self.btn_export.setEnabled(True)
+        self.status.showMessage(f"PDF exportado: {os.path.basename(file_path)}", 4000)
+        QtWidgets.QMessageBox.information(
+            self, "Éxito",
+            f"Archivo exportado exitosamente:\n{file_path}"
+        )
+
+    def _on_pdf_error(self, message):
+        self.btn_export.setEnabled(True)
+        self.status.clearMessage()
+        QtWidgets.QMessageBox.critical(
+            self, "Error",
+            f"No se pudo exportar el PDF:\n{message}"
+        )
+
     # ------------------------------------------------------------------
     # Funciones auxiliares para exportación
     # ------------------------------------------------------------------
-    def _export_tokens(self, title_style, subtitle_style):
+    # Estilos de párrafo del PDF, construidos una sola vez en la primera exportación
+    _PDF_STYLES = None
+
+    @classmethod
+    def _pdf_styles(cls):
+        if cls._PDF_STYLES is None:
+            from reportlab.lib import colors
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+            styles = getSampleStyleSheet()
+            cls._PDF_STYLES = {
+                # Estilo para títulos
+                "title": ParagraphStyle(
+                    'CustomTitle',
+                    parent=styles['Heading1'],
+                    fontSize=24,
+                    textColor=colors.HexColor('#007acc'),
+                    spaceAfter=30,
+                    alignment=1
+                ),
+                "subtitle": ParagraphStyle(
+                    'CustomSubtitle',
+                    parent=styles['Heading2'],
+                    fontSize=16,
+                    textColor=colors.HexColor('#007acc'),
+                    spaceAfter=20,
+                    spaceBefore=20
+                ),
+                # Bloques de texto del AST y del análisis semántico
+                "code": ParagraphStyle(
+                    'Code',
+                    parent=styles['Code'],
+                    fontSize=9,
+                    fontName='Courier',
+                    leftIndent=0,
+                    spaceBefore=0,
+                    spaceAfter=0
+                ),
+                "summary": ParagraphStyle('Summary', parent=styles['Normal'], fontSize=10),
+                "small": ParagraphStyle('Small', parent=styles['Normal'], fontSize=8),
+            }
+        return cls._PDF_STYLES
+
+    def _export_tokens(self, title_style, subtitle_style, include_title=True):
         """Exporta la tabla de tokens"""
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+
         elements = []
-        elements.append(Paragraph("Análisis Léxico - Tokens", title_style))
-        elements.append(Spacer(1, 20))
+        if include_title:
+            elements.append(Paragraph("Análisis Léxico - Tokens", title_style))
+            elements.append(Spacer(1, 20))
 
-        # Preparar datos de la tabla
+        # Preparar datos de la tabla directamente desde los tokens, sin pasar
+        # por model.index()/model.data() celda por celda
+        tokens = self.current_tokens
         data = [TokenTableModel.HEADERS]
-        model = self.table.model()
-        for row in range(model.rowCount()):
-            row_data = []
-            for col in range(model.columnCount()):
-                value = model.data(model.index(row, col), QtCore.Qt.ItemDataRole.DisplayRole)
-                row_data.append(str(value))
-            data.append(row_data)
+        data.extend([str(t.line), str(t.col), t.type, t.lexeme] for t in tokens)
 
         col_widths = [0.7 * inch, 0.7 * inch, 1.5 * inch, 3 * inch]
         table = Table(data, colWidths=col_widths, repeatRows=1)
@@ -697,63 +949,55 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Agregar resumen
         elements.append(Spacer(1, 20))
-        summary_style = ParagraphStyle('Summary', parent=getSampleStyleSheet()['Normal'], fontSize=10)
-        elements.append(Paragraph(f"Total de tokens: {model.rowCount()}", summary_style))
+        elements.append(Paragraph(f"Total de tokens: {len(tokens)}", self._pdf_styles()["summary"]))
 
         return elements
 
-    def _export_ast(self, title_style, subtitle_style):
+    def _export_ast(self, title_style, subtitle_style, include_title=True):
         """Exporta el AST"""
+        from reportlab.platypus import Paragraph, Spacer, Preformatted
+
         elements = []
-        elements.append(Paragraph("Análisis Sintáctico - AST", title_style))
-        elements.append(Spacer(1, 20))
+        if include_title:
+            elements.append(Paragraph("Análisis Sintáctico - AST", title_style))
+            elements.append(Spacer(1, 20))
 
-        ast_text = self.ast_view.toPlainText()
-
-        # Dividir en líneas y crear párrafos
-        code_style = ParagraphStyle(
-            'Code',
-            parent=getSampleStyleSheet()['Code'],
-            fontSize=9,
-            fontName='Courier',
-            leftIndent=0,
-            spaceBefore=0,
-            spaceAfter=0
-        )
+        ast_text = self._ast_str_cache
 
-        for line in ast_text.split('\n'):
-            elements.append(Paragraph(line.replace('<', '&lt;').replace('>', '&gt;'), code_style))
+        # Un solo bloque preformateado: conserva la indentación y no interpreta
+        # '<'/'>' como marcado; ReportLab lo parte entre páginas por líneas y
+        # corta las que no caben en el ancho del marco
+        elements.append(Preformatted(ast_text, self._pdf_styles()["code"],
+                                     maxLineLength=self._PDF_CODE_COLUMNS,
+                                     newLineChars=self._PDF_CODE_CONTINUATION))
 
         return elements
 
-    def _export_semantic(self, title_style, subtitle_style):
+    def _export_semantic(self, title_style, subtitle_style, include_title=True):
         """Exporta el análisis semántico"""
-        elements = []
-        elements.append(Paragraph("Análisis Semántico", title_style))
-        elements.append(Spacer(1, 20))
+        from reportlab.platypus import Paragraph, Spacer, Preformatted
 
-        semantic_text = self.semantic_view.toPlainText()
+        elements = []
+        if include_title:
+            elements.append(Paragraph("Análisis Semántico", title_style))
+            elements.append(Spacer(1, 20))
 
-        code_style = ParagraphStyle(
-            'Code',
-            parent=getSampleStyleSheet()['Code'],
-            fontSize=9,
-            fontName='Courier',
-            leftIndent=0,
-            spaceBefore=0,
-            spaceAfter=0
-        )
+        semantic_text = self._semantic_report_cache
 
-        for line in semantic_text.split('\n'):
-            elements.append(Paragraph(line.replace('<', '&lt;').replace('>', '&gt;'), code_style))
+        elements.append(Preformatted(semantic_text, self._pdf_styles()["code"],
+                                     maxLineLength=self._PDF_CODE_COLUMNS,
+                                     newLineChars=self._PDF_CODE_CONTINUATION))
 
         return elements
 
-    def _export_automata(self, title_style, subtitle_style):
+    def _export_automata(self, title_style, subtitle_style, include_title=True):
         """Exporta el autómata generado"""
+        from reportlab.platypus import Paragraph, Spacer
+
         elements = []
-        elements.append(Paragraph("Autómata Generado", title_style))
-        elements.append(Spacer(1, 20))
+        if include_title:
+            elements.append(Paragraph("Autómata Generado", title_style))
+            elements.append(Spacer(1, 20))
 
         if not hasattr(self, 'current_automata_path') or not self.current_automata_path:
             elements.append(Paragraph("No hay autómata disponible para exportar.", subtitle_style))
@@ -767,6 +1011,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # Agregar la imagen del autómata al PDF
             from reportlab.platypus import Image
+            from reportlab.lib.pagesizes import letter
             from reportlab.lib.units import inch
 
             # Verificar que el archivo de imagen existe
@@ -792,17 +1037,21 @@ class MainWindow(QtWidgets.QMainWindow):
                 elements.append(img)
                 elements.append(Spacer(1, 10))
                 elements.append(Paragraph(f"Tamaño: {img.drawWidth:.1f} x {img.drawHeight:.1f} puntos",
-                                          ParagraphStyle('Small', parent=getSampleStyleSheet()['Normal'], fontSize=8)))
+                                          self._pdf_styles()["small"]))
             else:
                 elements.append(Paragraph("Error: No se encontró la imagen del autómata.", subtitle_style))
 
         except Exception as e:
-            elements.append(Paragraph(f"Error al exportar el autómata: {str(e)}", subtitle_style))
+            # Paragraph interpreta marcado: el mensaje puede traer '<', '>' o '&'
+            elements.append(Paragraph(f"Error al exportar el autómata: {_html_escape(str(e), quote=False)}",
+                                      subtitle_style))
 
         return elements
 
     def _export_all(self, title_style, subtitle_style):
         """Exporta todo el análisis completo"""
+        from reportlab.platypus import Paragraph, Spacer
+
         elements = []
         elements.append(Paragraph("Análisis Completo del Compilador", title_style))
         elements.append(Spacer(1, 30))
@@ -810,25 +1059,25 @@ class MainWindow(QtWidgets.QMainWindow):
         # Tokens
         if self.current_tokens:
             elements.append(Paragraph("1. Análisis Léxico", subtitle_style))
-            elements.extend(self._export_tokens(None, None)[2:])  # Omitir título duplicado
+            elements.extend(self._export_tokens(None, None, include_title=False))
             elements.append(Spacer(1, 30))
 
         # AST
         if self.current_ast:
             elements.append(Paragraph("2. Análisis Sintáctico", subtitle_style))
-            elements.extend(self._export_ast(None, None)[2:])  # Omitir título duplicado
+            elements.extend(self._export_ast(None, None, include_title=False))
             elements.append(Spacer(1, 30))
 
         # Semántico
-        if self.semantic_view.toPlainText().strip():
+        if self._semantic_report_cache:
             elements.append(Paragraph("3. Análisis Semántico", subtitle_style))
-            elements.extend(self._export_semantic(None, None)[2:])  # Omitir título duplicado
+            elements.extend(self._export_semantic(None, None, include_title=False))
             elements.append(Spacer(1, 30))
 
         # Autómata
         if hasattr(self, 'current_automata_path') and self.current_automata_path and os.path.exists(
                 self.current_automata_path):
             elements.append(Paragraph("4. Autómata", subtitle_style))
-            elements.extend(self._export_automata(None, None)[2:])  # Omitir título duplicado
+            elements.extend(self._export_automata(None, None, include_title=False))
 
         return elements
\ No newline at end of file
@@ -1,11 +1,32 @@
 import re
-from .tokens import KEYWORDS, OPERATORS, TOKEN_NAME, Token, LexError
+from .tokens import KEYWORDS, OP_BY_FIRST, SINGLE_CHAR_TOKENS, Token, LexError
 
 RE_STRING = r'"[^"\n]*"'
 RE_TEMPLATE_STRING = r'`([^`\\]|\\.)*`'
 RE_NUM    = r'(?:\d+\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)'
 RE_ID     = r'[A-Za-z_][A-Za-z_0-9]*'
 RE_WS     = r'[ \t\r\n]+'
+RE_COMMENT= r'//[^\n]*'
+
+# Tramos consecutivos de espacios y comentarios de línea, saltados en una sola búsqueda
+RE_SKIP   = re.compile(f'(?:{RE_WS}|{RE_COMMENT})+')
+
+# Reglas (tipo de token, patrón) en orden de prioridad
+TOKEN_RULES = (("STRING", RE_STRING), ("NUM", RE_NUM), ("ID", RE_ID))
+
+# Todas las reglas en un solo patrón precompilado: el motor de `re` recorre el
+# lexema completo en C y `lastgroup` indica la regla que coincidió
+RE_TOKEN  = re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in TOKEN_RULES))
+
+# Tokens que se emiten con solo mirar el primer carácter. Se excluyen '.'
+# (puede iniciar un número: .5) y '`' (abre un template string)
+FAST_SINGLE = {ch:t for ch,t in SINGLE_CHAR_TOKENS.items() if ch not in ".`"}
+
+def _bits(chars): return sum(1<<ord(c) for c in set(chars))
+
+# Clase "puede iniciar STRING/NUM/ID" como bitset entero: `MASK >> ord(ch) & 1`
+# evita intentar RE_TOKEN sobre operadores (==, <=, &&, ...)
+TOKEN_START = _bits('"._0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
 
 class Lexer:
     def __init__(self, src:str):
@@ -22,73 +43,62 @@ class Lexer:
         self.advance(1)
         return ch
     def advance(self,c=1):
-        for _ in range(c):
-            ch=self.src[self.i]; self.i+=1
-            if ch=="\n": self.line+=1; self.col=1
-            else: self.col+=1
-
-    def _m(self,pat): 
-        m=re.match(pat, self.src[self.i:]); 
-        return m.group(0) if m else None
+        # Línea/columna por tramo: count/rfind recorren el lexema en C
+        i=self.i; j=i+c; k=self.src.count("\n",i,j)
+        if k: self.line+=k; self.col=j-self.src.rfind("\n",i,j)
+        else: self.col+=c
+        self.i=j
 
     def _skip(self):
-        while True:
-            m=self._m(RE_WS)
-            if m: self.advance(len(m)); continue
-            if self.src[self.i:self.i+2]=="//":
-                while not self.eof() and self.peek()!="\n": self.advance()
-                continue
-            break
+        m=RE_SKIP.match(self.src, self.i)
+        if m: self.advance(m.end()-self.i)
 
     def tokenize(self):
-        toks=[]
+        toks=[]; src=self.src
         while not self.eof():
             self._skip()
             if self.eof(): break
             L,C=self.line,self.col
 
-            if self.peek() == '`':
-                template_content = []
-                self.advance()  # Consumir backtick inicial
-                start_line, start_col = self.line, self.col
-
-                while not self.eof() and self.peek() != '`':
-                    if self.peek() == '$' and self.peek(1) == '{':
-                        # Token de inicio de interpolación
-                        toks.append(Token("TEMPLATE_START", "${", self.line, self.col))
-                        self.advance(2)
-                        # Parsear expresión dentro de ${}
-                        # Esto requiere lógica adicional
-                    else:
-                        # Accumular contenido del template
-                        ch = self.get()
-                        template_content.append(ch)
-
-                if self.peek() == '`':
-                    self.advance()
-                else:
-                    raise LexError(L, C, "Template string no cerrado")
+            ch=src[self.i]
+            # Identificadores y números son los tokens más frecuentes: se prueban primero
+            if TOKEN_START >> ord(ch) & 1:
+                m=RE_TOKEN.match(src, self.i)
+                if m:
+                    t=m.lastgroup; lex=m.group()
+                    if t=="ID": t=KEYWORDS.get(lex,"ID")
+                    toks.append(Token(t,lex,L,C)); self.advance(len(lex)); continue
+                if ch=='"': raise LexError(L,C,src[self.i:self.i+20])
 
-                continue
-            if self.peek()=='"':
-                m=self._m(RE_STRING)
-                if not m: raise LexError(L,C,self.src[self.i:self.i+20])
-                toks.append(Token("STRING",m,L,C)); self.advance(len(m)); continue
+            t=FAST_SINGLE.get(ch)
+            if t: toks.append(Token(t,ch,L,C)); self.advance(); continue
 
-            m=self._m(RE_NUM)
-            if m: toks.append(Token("NUM",m,L,C)); self.advance(len(m)); continue
+            if ch == '`':
+                self.advance()  # Consumir backtick inicial
 
-            m=self._m(RE_ID)
-            if m:
-                t=KEYWORDS.get(m,"ID")
-                toks.append(Token(t,m,L,C)); self.advance(len(m)); continue
+                # Saltar por offsets hasta el backtick de cierre; el contenido
+                # no se acumula, solo se emiten los inicios de interpolación
+                while True:
+                    end = self.src.find('`', self.i)
+                    interp = self.src.find('${', self.i, end if end >= 0 else self.n)
+                    if interp < 0:
+                        break
+                    self.advance(interp - self.i)
+                    # Token de inicio de interpolación
+                    # (parsear la expresión dentro de ${} requiere lógica adicional)
+                    toks.append(Token("TEMPLATE_START", "${", self.line, self.col))
+                    self.advance(2)
 
+                if end < 0:
+                    raise LexError(L, C, "Template string no cerrado")
+                self.advance(end - self.i + 1)
+                continue
             op=None
-            for o in sorted(OPERATORS, key=lambda s:(-len(s), s)):
-                if self.src.startswith(o,self.i): op=o; break
+            for o,name in OP_BY_FIRST.get(ch, ()):
+                if src.startswith(o,self.i): op=o; break
             if op:
-                toks.append(Token(TOKEN_NAME[op], op, L, C)); self.advance(len(op)); continue
+                toks.append(Token(name, op, L, C)); self.advance(len(op)); continue
 
-            raise LexError(L,C,self.peek())
+            raise LexError(L,C,ch)
         toks.append(Token("EOF","EOF", self.line, self.col))
         return toks
@@ -1,19 +1,46 @@
+import hashlib
+import json
+import os
+from array import array
 from dataclasses import dataclass
-from typing import Set, Dict, FrozenSet, List, Optional
+from pathlib import Path
+from typing import Set, Dict, FrozenSet, Iterable, List, Optional
 
 # NFA state
 class NFAState:
-    __slots__=("eps","trans","accepts")
+    __slots__=("id","eps","trans","accepts","_ec")
+    # Ids consecutivos: los recorridos marcan visitados en un bytearray por id
+    _next_id=0
     def __init__(self):
-        self.eps:set[NFAState]=set()
-        self.trans:dict[str,set[NFAState]]={}
+        self.id=NFAState._next_id; NFAState._next_id+=1
+        # Thompson no genera aristas ε repetidas desde un mismo estado: basta una lista
+        self.eps:list[NFAState]=[]
+        # Aristas etiquetadas con un conjunto de caracteres como máscara de bits:
+        # (mascara, destino), el bit ord(ch) encendido si ch sigue la arista
+        self.trans:list[tuple[int,NFAState]]=[]
         self.accepts:set[str]=set()
+        # Cierre-ε precalculado por precompute_closures (el NFA ya no cambia)
+        self._ec:FrozenSet[NFAState]=frozenset()
 
 @dataclass
 class NFA:
     start: NFAState
     end: NFAState
 
+# Conjuntos de caracteres precalculados una sola vez
+_ASCII=tuple(chr(c) for c in range(128))
+_PRINTABLE=frozenset(_ASCII[32:127])
+_ALPHABET=_PRINTABLE | {"\n","\t","\r"}
+
+def _mask(chs)->int:
+    m=0
+    for c in chs: m|=1<<ord(c)
+    return m
+
+_PRINTABLE_MASK=_mask(_PRINTABLE)
+# Secuencias de escape: se construye una vez, no en cada llamada a _esc
+_ESCAPES={"n":"\n","t":"\t","r":"\r","\\":"\\",'"':'"',"[":"[","]":"]","(":"(",")":")","|":"|","?":"?","*":"*","+":"+"}
+
 # Simple regex builder: literals, ., [], ranges, escapes, (), |, *, +, ?
 class RegexParseError(Exception): pass
 
@@ -22,6 +49,20 @@ class RegexBuilder:
     def peek(self): return self.p[self.i] if self.i<self.n else ""
     def get(self): ch=self.peek(); self.i+=1; return ch
 
+    @classmethod
+    def literal_trie(cls, words)->NFAState:
+        """NFA trie de cadenas literales: los prefijos comunes comparten estados"""
+        root=NFAState(); children:dict[tuple[int,str],NFAState]={}
+        for w in words:
+            node=root
+            for ch in w:
+                nxt=children.get((node.id,ch))
+                if nxt is None:
+                    nxt=children[(node.id,ch)]=NFAState(); node.trans.append((1<<ord(ch),nxt))
+                node=nxt
+            node.accepts.add(w)
+        return root
+
     def parse(self)->NFA:
         n=self.alt()
         if self.i!=self.n: raise RegexParseError(f"Unexpected at {self.i}")
@@ -38,14 +79,14 @@ class RegexBuilder:
         while self.peek() and self.peek() not in ")|":
             parts.append(self.repeat())
         if not parts:
-            s1,s2=NFAState(),NFAState(); s1.eps.add(s2); return NFA(s1,s2)
+            s1,s2=NFAState(),NFAState(); s1.eps.append(s2); return NFA(s1,s2)
         n=parts[0]
         for p in parts[1:]: n=self._concat(n,p)
         return n
 
     def repeat(self)->NFA:
         u=self.atom()
-        while self.peek() in "*+?":
+        while self.peek() and self.peek() in "*+?":
             op=self.get()
             if op=="*": u=self._star(u)
             elif op=="+": u=self._plus(u)
@@ -59,128 +100,276 @@ class RegexBuilder:
             if self.get()!=")": raise RegexParseError("Unmatched (")
             return inside
         if ch=="[":
-            self.get(); chars=set(); neg=False
+            # La clase se acumula directamente como máscara de bits
+            self.get(); mask=0; neg=False
             if self.peek()=="^": neg=True; self.get()
             while self.peek() and self.peek()!="]":
                 a=self._esc()
                 if self.peek()=="-" and self.p[self.i+1]!="]":
-                    self.get(); b=self._esc()
-                    for c in range(ord(a),ord(b)+1): chars.add(chr(c))
-                else: chars.add(a)
+                    self.get(); b=self._esc(); lo,hi=ord(a),ord(b)+1
+                    if hi>lo: mask|=((1<<(hi-lo))-1)<<lo
+                else: mask|=1<<ord(a)
             if self.get()!="]": raise RegexParseError("Unmatched [")
-            if neg:
-                universe=set(chr(c) for c in range(32,127))
-                chars=universe-chars
-            return self._class(chars)
+            if neg: mask=_PRINTABLE_MASK & ~mask
+            return self._edge(mask)
         if ch==".":
-            self.get(); chars=set(chr(c) for c in range(32,127))
-            return self._class(chars)
+            self.get(); return self._edge(_PRINTABLE_MASK)
         if ch=="\\": a=self._esc(); return self._lit(a)
         if not ch:
-            s1,s2=NFAState(),NFAState(); s1.eps.add(s2); return NFA(s1,s2)
+            s1,s2=NFAState(),NFAState(); s1.eps.append(s2); return NFA(s1,s2)
         self.get(); return self._lit(ch)
 
     def _esc(self)->str:
         ch=self.get()
         if ch!="\\": return ch
-        m={"n":"\n","t":"\t","r":"\r","\\":"\\",'"':'"',"[":"[","]":"]","(":"(",")":")","|":"|","?":"?","*":"*","+":"+"}
-        return m.get(self.get(), ch)
-
-    def _lit(self,ch:str)->NFA:
-        s1,s2=NFAState(),NFAState(); s1.trans.setdefault(ch,set()).add(s2); return NFA(s1,s2)
-    def _class(self,chs:Set[str])->NFA:
-        s1,s2=NFAState(),NFAState()
-        for c in chs: s1.trans.setdefault(c,set()).add(s2)
-        return NFA(s1,s2)
-    def _concat(self,a:NFA,b:NFA)->NFA: a.end.eps.add(b.start); return NFA(a.start,b.end)
+        # Un escape desconocido (\. \{ \-) es el propio carácter, no la barra
+        nxt=self.get()
+        return _ESCAPES.get(nxt, nxt) if nxt else ch
+
+    def _edge(self,mask:int)->NFA:
+        s1,s2=NFAState(),NFAState(); s1.trans.append((mask,s2)); return NFA(s1,s2)
+    def _lit(self,ch:str)->NFA: return self._edge(1<<ord(ch))
+    def _concat(self,a:NFA,b:NFA)->NFA: a.end.eps.append(b.start); return NFA(a.start,b.end)
     def _alt(self,a:NFA,b:NFA)->NFA:
-        s,e=NFAState(),NFAState(); s.eps.update([a.start,b.start]); a.end.eps.add(e); b.end.eps.add(e); return NFA(s,e)
+        s,e=NFAState(),NFAState(); s.eps.extend((a.start,b.start)); a.end.eps.append(e); b.end.eps.append(e); return NFA(s,e)
     def _star(self,a:NFA)->NFA:
-        s,e=NFAState(),NFAState(); s.eps.update([a.start,e]); a.end.eps.update([a.start,e]); return NFA(s,e)
+        s,e=NFAState(),NFAState(); s.eps.extend((a.start,e)); a.end.eps.extend((a.start,e)); return NFA(s,e)
     def _plus(self,a:NFA)->NFA:
-        s,e=NFAState(),NFAState(); s.eps.add(a.start); a.end.eps.update([a.start,e]); return NFA(s,e)
+        s,e=NFAState(),NFAState(); s.eps.append(a.start); a.end.eps.extend((a.start,e)); return NFA(s,e)
     def _opt(self,a:NFA)->NFA:
-        s,e=NFAState(),NFAState(); s.eps.update([a.start,e]); a.end.eps.add(e); return NFA(s,e)
+        s,e=NFAState(),NFAState(); s.eps.extend((a.start,e)); a.end.eps.append(e); return NFA(s,e)
 
-def epsilon_closure(states:Set[NFAState])->Set[NFAState]:
-    st=list(states); res=set(states)
-    while st:
-        s=st.pop()
+def precompute_closures(start:NFAState):
+    """Calcula una vez el cierre-ε de cada estado alcanzable desde start"""
+    size=NFAState._next_id
+    seen=bytearray(size); seen[start.id]=1; order=[start]
+    for s in order:
         for t in s.eps:
-            if t not in res: res.add(t); st.append(t)
-    return res
+            if not seen[t.id]: seen[t.id]=1; order.append(t)
+        for _,t in s.trans:
+            if not seen[t.id]: seen[t.id]=1; order.append(t)
+    for s in order:
+        visited=bytearray(size); stack=[s]; res=[]
+        while stack:
+            u=stack.pop()
+            if visited[u.id]: continue
+            visited[u.id]=1; res.append(u); stack.extend(u.eps)
+        s._ec=frozenset(res)
 
-def move(states:Set[NFAState], ch:str)->Set[NFAState]:
-    out=set()
+def epsilon_closure(states:Iterable[NFAState])->FrozenSet[NFAState]:
+    return frozenset().union(*(s._ec for s in states))
+
+def _accepts_of(states:Iterable[NFAState])->FrozenSet[str]:
+    # Un solo set mutable y un solo frozenset; casi todos los estados no aceptan nada
+    acc=set()
     for s in states:
-        if ch in s.trans: out.update(s.trans[ch])
-    return out
+        if s.accepts: acc|=s.accepts
+    return frozenset(acc)
 
-from dataclasses import dataclass
-@dataclass(frozen=True)
-class DFAState:
-    id:int
-    accepts:frozenset[str]
+def move(states:Iterable[NFAState], ch:str)->Set[NFAState]:
+    bit=1<<ord(ch)
+    return {t for s in states for m,t in s.trans if m & bit}
+
+def _bits(mask:int):
+    """Códigos de los bits encendidos en mask, de menor a mayor"""
+    while mask:
+        low=mask & -mask; yield low.bit_length()-1; mask^=low
+
+# Caracteres cubiertos por la tabla densa: un código por carácter ASCII
+TABLE_WIDTH=128
 
 class DFA:
     def __init__(self):
         self.start:int=0
-        self.state_list:list[DFAState]=[]
-        self.trans:dict[int,dict[str,int]]={}
-        self._map:dict[frozenset[NFAState],int]={}
+        # Tokens aceptados por cada estado, indexado por id de estado
+        self.accepts:list[frozenset[str]]=[]
+        # Alfabeto comprimido: eqclass[ord(ch)] -> clase de equivalencia. Los
+        # caracteres con la misma columna en todos los estados comparten clase
+        self.eqclass:array=array("B")
+        self.width:int=0
+        # Única representación de las transiciones, una matriz contigua int16 con
+        # una fila física por fila distinta; los estados con filas idénticas la
+        # comparten: table[row_of[s]*width+eqclass[ord(ch)]] -> destino, -1 si no hay
+        self.row_of:array=array("H")
+        self.table:array=array("h")
+        # Bit s encendido si el estado s es de aceptación: accept_mask >> s & 1
+        self.accept_mask:int=0
+
+    def build_table(self, trans:dict[int,dict[int,int]]):
+        """trans[s] = {destino: máscara de caracteres que llevan de s a destino}"""
+        n=len(self.accepts); full=(1<<TABLE_WIDTH)-1
+        dense=[[-1]*TABLE_WIDTH for _ in range(n)]
+        for s,outs in trans.items():
+            row=dense[s]
+            for t,m in outs.items():
+                for c in _bits(m & full): row[c]=t
+        classes:dict[tuple,int]={}; eqclass=array("B",bytes(TABLE_WIDTH))
+        for c in range(TABLE_WIDTH):
+            col=tuple(row[c] for row in dense)
+            eqclass[c]=classes.setdefault(col,len(classes))
+        k=len(classes); cols=list(classes)
+        rows:dict[tuple,int]={}; row_of=array("H",[0])*n
+        for s in range(n):
+            row_of[s]=rows.setdefault(tuple(col[s] for col in cols),len(rows))
+        table=array("h")
+        for row in rows: table.extend(row)
+        self.eqclass=eqclass; self.width=k; self.row_of=row_of; self.table=table
+        self.accept_mask=sum(1<<i for i,acc in enumerate(self.accepts) if acc)
+
+    @staticmethod
+    def cache_path(h:str)->str:
+        return os.path.join(_CACHE_DIR,f"dfa_{h}.json")
+
+    @classmethod
+    def from_cached(cls, h:str)->Optional["DFA"]:
+        """AFD guardado por save_cache con la clave h, o None si no hay uno válido"""
+        # Cualquier archivo truncado, ajeno o de otra versión se trata como fallo
+        # de caché: quien llama reconstruye el AFD en lugar de caerse al arrancar
+        try:
+            # JSON y no pickle: cargar un archivo manipulado nunca ejecuta código
+            with open(cls.cache_path(h),encoding="utf-8") as f:
+                start,accepts,eqclass,width,row_of,table=json.load(f)
+            if not all(isinstance(a,list) for a in accepts): return None
+            d=cls(); d.accepts=[frozenset(a) for a in accepts]
+            d.eqclass=array("B",eqclass); d.row_of=array("H",row_of); d.table=array("h",table)
+            n=len(d.accepts)
+            if not all(isinstance(t,str) for a in d.accepts for t in a): return None
+            if type(start) is not int or type(width) is not int or not 0<=start<n or width<=0: return None
+            if len(d.eqclass)!=TABLE_WIDTH or max(d.eqclass)>=width: return None
+            if len(d.table)%width or len(d.row_of)!=n: return None
+            if n and max(d.row_of)>=len(d.table)//width: return None
+            if d.table and not -1<=min(d.table)<=max(d.table)<n: return None
+            d.start=start; d.width=width
+            d.accept_mask=sum(1<<i for i,acc in enumerate(d.accepts) if acc)
+            return d
+        except Exception:
+            return None
+
+    def save_cache(self, h:str):
+        # Solo datos planos (enteros, cadenas, listas): nada de NFAState
+        data=[self.start,[sorted(a) for a in self.accepts],self.eqclass.tolist(),
+              self.width,self.row_of.tolist(),self.table.tolist()]
+        path=self.cache_path(h); tmp=f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(_CACHE_DIR,exist_ok=True)
+            with open(tmp,"w",encoding="utf-8") as f: json.dump(data,f,separators=(",",":"))
+            os.replace(tmp,path)
+        except OSError:
+            # Sin caché: la próxima ejecución simplemente vuelve a construir el AFD
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def step(self, s:int, ch:str)->int:
+        c=ord(ch)
+        return self.table[self.row_of[s]*self.width+self.eqclass[c]] if c<TABLE_WIDTH else -1
+
+    def transitions(self, s:int)->dict[str,int]:
+        """Transiciones salientes de s leídas de la tabla: carácter -> destino"""
+        base=self.row_of[s]*self.width; table=self.table; eqclass=self.eqclass
+        return {_ASCII[c]:t for c in range(TABLE_WIDTH) if (t:=table[base+eqclass[c]])>=0}
 
     def build(self, start_nfa:NFAState, alphabet:set[str]):
-        start=frozenset(epsilon_closure({start_nfa}))
-        self._map[start]=0
-        acc=frozenset().union(*(s.accepts for s in start))
-        self.state_list.append(DFAState(0, frozenset(acc))); self.trans[0]={}
+        alpha=_mask(alphabet)
+        start=start_nfa._ec
+        # Subconjunto de estados del NFA -> id del AFD; vive solo durante build para
+        # no retener los frozenset ni el grafo del NFA una vez construida la tabla
+        ids:dict[FrozenSet[NFAState],int]={start:0}
+        self.accepts.append(_accepts_of(start)); trans={0:{}}
         work=[start]; sid=1
         while work:
-            S=work.pop(); s_id=self._map[S]
-            for ch in alphabet:
-                T=frozenset(epsilon_closure(move(set(S),ch)))
-                if not T: continue
-                if T not in self._map:
-                    self._map[T]=sid
-                    acc=frozenset().union(*(t.accepts for t in T))
-                    self.state_list.append(DFAState(sid, frozenset(acc)))
-                    self.trans[s_id][ch]=sid; self.trans[sid]={}; work.append(T); sid+=1
+            S=work.pop(); s_id=ids[S]; outs=trans[s_id]
+            edges:dict[int,set[NFAState]]={}
+            for s in S:
+                for m,t in s.trans:
+                    if m & alpha: edges.setdefault(m & alpha,set()).add(t)
+            # Partición del alfabeto en clases que siguen las mismas aristas:
+            # el destino se calcula una vez por clase y no por carácter
+            parts:list[int]=[]
+            for m in edges:
+                nxt=[]; rest=m
+                for p in parts:
+                    if p & m: nxt.append(p & m); rest&=~p
+                    if p & ~m: nxt.append(p & ~m)
+                if rest: nxt.append(rest)
+                parts=nxt
+            for p in parts:
+                # move y cierre-ε en una sola pasada: un único frozenset por destino
+                T=frozenset().union(*(t._ec for m,ts in edges.items() if m & p for t in ts))
+                if T not in ids:
+                    ids[T]=sid
+                    self.accepts.append(_accepts_of(T))
+                    trans[sid]={}; work.append(T); tid=sid; sid+=1
                 else:
-                    self.trans[s_id][ch]=self._map[T]
+                    tid=ids[T]
+                outs[tid]=outs.get(tid,0) | p
         self.start=0
+        self.build_table(trans)
 
     def minimize(self):
-        all_states=set(range(len(self.state_list)))
-        groups:dict[frozenset[str],set[int]]={}
-        for s in all_states:
-            groups.setdefault(self.state_list[s].accepts,set()).add(s)
-        P=list(groups.values()); W=[g.copy() for g in P]
-        alphabet=set(ch for d in self.trans.values() for ch in d.keys())
+        # Hopcroft sobre una partición refinable en arreglos (Valmari-Lehtinen):
+        # elems agrupa los estados por bloque, cada bloque es elems[first:end] y
+        # los marcados en una ronda quedan al frente, en elems[first:mid]
+        n=len(self.accepts); table=self.table; k=self.width; row_of=self.row_of
+        # Pre-pasada: los estados con la misma aceptación y la misma fila física
+        # ya son equivalentes; Hopcroft refina solo un representante de cada grupo
+        sig:dict[tuple,int]={}; rep=[0]*n; orig:list[int]=[]
+        for s in range(n):
+            u=sig.setdefault((self.accepts[s],row_of[s]),len(sig))
+            if u==len(orig): orig.append(s)
+            rep[s]=u
+        r=len(orig)
+        # inv[e][t]: representantes que van a t con la clase de equivalencia e
+        inv=[[[] for _ in range(r)] for _ in range(k)]
+        for u,s in enumerate(orig):
+            base=row_of[s]*k
+            for e in range(k):
+                t=table[base+e]
+                if t>=0: inv[e][rep[t]].append(u)
+        groups:dict[frozenset[str],list[int]]={}
+        for u,s in enumerate(orig): groups.setdefault(self.accepts[s],[]).append(u)
+        elems:list[int]=[]; first:list[int]=[]; end:list[int]=[]
+        block=[0]*r
+        for b,g in enumerate(groups.values()):
+            first.append(len(elems)); elems.extend(g); end.append(len(elems))
+            for u in g: block[u]=b
+        mid=first[:]; loc=[0]*r
+        for i,s in enumerate(elems): loc[s]=i
+        # Partición parcial: todos los bloques iniciales entran a la lista de trabajo
+        W=[(b,e) for b in range(len(first)) for e in range(k)]
+        pending={*W}
         while W:
-            A=W.pop()
-            for c in alphabet:
-                X={s for s in all_states if c in self.trans.get(s,{}) and self.trans[s][c] in A}
-                newP=[]
-                for Y in P:
-                    inter=Y & X; diff=Y - X
-                    if inter and diff:
-                        newP.extend([inter,diff])
-                        if Y in W: W.remove(Y); W.extend([inter,diff])
-                        else: W.append(inter if len(inter)<=len(diff) else diff)
-                    else: newP.append(Y)
-                P=newP
-        block={}
-        for i,blk in enumerate(P):
-            for s in blk: block[s]=i
-        new_states=[]; new_trans={i:{} for i in range(len(P))}
-        for i,blk in enumerate(P):
-            rep=next(iter(blk)); acc=frozenset()
-            for s in blk: acc=acc | self.state_list[s].accepts
-            new_states.append(DFAState(i,acc))
-        for s,outs in self.trans.items():
-            bs=block[s]
-            for ch,t in outs.items(): new_trans[bs][ch]=block[t]
-        self.state_list=new_states; self.trans=new_trans; self.start=block[self.start]
+            B,e=W.pop(); pending.discard((B,e))
+            preds=[p for t in elems[first[B]:end[B]] for p in inv[e][t]]
+            touched=[]
+            for p in preds:
+                b=block[p]; i=loc[p]; m=mid[b]
+                if i<m: continue
+                if m==first[b]: touched.append(b)
+                q=elems[m]; elems[m]=p; elems[i]=q; loc[p]=m; loc[q]=i; mid[b]=m+1
+            for b in touched:
+                m=mid[b]; mid[b]=first[b]
+                if m==end[b]: continue
+                # Los marcados forman el bloque nuevo nb; b conserva el resto
+                nb=len(first); first.append(first[b]); end.append(m); mid.append(first[b])
+                first[b]=mid[b]=m
+                for s in elems[first[nb]:m]: block[s]=nb
+                small=nb if m-first[nb]<=end[b]-m else b
+                for c in range(k):
+                    x=(nb if (b,c) in pending else small,c)
+                    W.append(x); pending.add(x)
+        nblocks=len(first)
+        new_accepts=[self.accepts[orig[elems[first[b]]]] for b in range(nblocks)]
+        new_trans={i:{} for i in range(nblocks)}
+        # Una máscara por clase de equivalencia: las aristas se copian por clase
+        class_mask=[0]*k
+        for c in range(TABLE_WIDTH): class_mask[self.eqclass[c]]|=1<<c
+        for u,s in enumerate(orig):
+            outs=new_trans[block[u]]; base=row_of[s]*k
+            for e in range(k):
+                t=table[base+e]
+                if t>=0: b=block[rep[t]]; outs[b]=outs.get(b,0) | class_mask[e]
+        self.accepts=new_accepts; self.start=block[rep[self.start]]
+        self.build_table(new_trans)
 
     def to_dot(self, path:str):
         def esc(x:str):
@@ -188,44 +377,67 @@ class DFA:
             if x=="\\": return r'\\'
             if x=="\n": return r'\\n'
             return x
+        def ranges(chs:list[str]):
+            # chs llega ordenado por código: una pasada agrupa tramos consecutivos (a-z)
+            parts=[]; i=0; n=len(chs)
+            while i<n:
+                j=i
+                while j+1<n and ord(chs[j+1])==ord(chs[j])+1: j+=1
+                if j-i>=2: parts.append(f"{esc(chs[i])}-{esc(chs[j])}")
+                else: parts.extend(esc(c) for c in chs[i:j+1])
+                i=j+1
+            return ",".join(parts)
         with open(path,"w",encoding="utf-8") as f:
             f.write("digraph DFA {\n  rankdir=LR;\n  node [shape=circle];\n")
             f.write(f"  __start__ [shape=point];\n  __start__ -> S{self.start};\n")
-            for i,st in enumerate(self.state_list):
-                shape="doublecircle" if st.accepts else "circle"
-                acc=sorted(list(st.accepts))[:4]; extra="" if len(st.accepts)<=4 else ",…"
-                label=f"S{i}" if not st.accepts else f"S{i}\\n[{', '.join(acc)}{extra}]"
+            for i,accepts in enumerate(self.accepts):
+                shape="doublecircle" if accepts else "circle"
+                acc=sorted(list(accepts))[:4]; extra="" if len(accepts)<=4 else ",…"
+                label=f"S{i}" if not accepts else f"S{i}\\n[{', '.join(acc)}{extra}]"
                 f.write(f'  S{i} [shape={shape}, label="{label}"];\n')
-            for s,outs in self.trans.items():
-                by={}
+            for s in range(len(self.accepts)):
+                outs=self.transitions(s); by={}
                 for ch,t in outs.items(): by.setdefault(t,[]).append(ch)
                 for t,chs in by.items():
-                    lab=",".join(esc(c) for c in sorted(chs))
-                    f.write(f'  S{s} -> S{t} [label="{lab}"];\n')
+                    f.write(f'  S{s} -> S{t} [label="{ranges(chs)}"];\n')
             f.write("}\n")
 
+TOKEN_PATTERNS={
+    "STRING": r'"[^"\n]*"',
+    "NUM": r'((([0-9]+)?\.[0-9]+)|([0-9]+))([eE][+\-]?[0-9]+)?',
+    "ID": r'[A-Za-z_][A-Za-z_0-9]*',
+    "WS": r'[ \t\r\n]+',
+    "COMMENT": r'//[^\n]*',
+}
+# Operators
+TOKEN_OPS=("===","!==","==","!=","*=","+=","-=",
+           "<=", ">=","||", "&&","{","}","(",")",
+           "[","]",";",":","`","'",",",".","${",
+           "=","<",">","+","-","*","/","%","!")
+
+# Caché en disco del AFD mínimo; subir la versión si cambia el formato del archivo
+_CACHE_VERSION=3
+_CACHE_DIR=os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"),".cache"),
+                        "lexico_ll1")
+
+def _cache_key()->str:
+    # La clave incluye el código de este módulo: cualquier cambio en el parser de
+    # regex, la construcción de subconjuntos o minimize invalida la caché sola
+    h=hashlib.blake2b(repr((_CACHE_VERSION,sorted(TOKEN_PATTERNS.items()),TOKEN_OPS)).encode("utf-8"))
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()[:16]
+
 def build_token_nfa()->NFAState:
-    patterns={
-        "STRING": r'"[^"\n]*"',
-        "NUM": r'((([0-9]+)?\.[0-9]+)|([0-9]+))([eE][+\-]?[0-9]+)?',
-        "ID": r'[A-Za-z_][A-Za-z_0-9]*',
-        "WS": r'[ \t\r\n]+',
-        "COMMENT": r'//[^\n]*',
-    }
-    # Operators
-    ops=["===","!==","==","!=","*=","+=","-=",
-         "<=", ">=","||", "&&","{","}","(",")",
-         "[","]",";",":","`","'",",",".","${",
-         "=","<",">","+","-","*","/","%","!"]
     super_start=NFAState()
-    for name,pat in patterns.items():
-        n=RegexBuilder(pat).parse(); n.end.accepts.add(name); super_start.eps.add(n.start)
-    for op in ops:
-        esc="".join(("\\"+c) if c in r'[](){}.*+?|^$\/' else c for c in op)
-        n=RegexBuilder(esc).parse(); n.end.accepts.add(op); super_start.eps.add(n.start)
+    for name,pat in TOKEN_PATTERNS.items():
+        n=RegexBuilder(pat).parse(); n.end.accepts.add(name); super_start.eps.append(n.start)
+    super_start.eps.append(RegexBuilder.literal_trie(TOKEN_OPS))
+    precompute_closures(super_start)
     return super_start
 
 def build_min_dfa()->DFA:
+    h=_cache_key()
+    d=DFA.from_cached(h)
+    if d is not None: return d
     start=build_token_nfa()
-    alphabet=set(chr(c) for c in range(32,127)) | {"\n","\t","\r"}
-    d=DFA(); d.build(start, alphabet); d.minimize(); return d
+    d=DFA(); d.build(start, _ALPHABET); d.minimize(); d.save_cache(h); return d
@@ -6,11 +6,23 @@ Realiza análisis semántico del AST, incluyendo:
 - Análisis de scope
 - Detección de variables no usadas
 """
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from .ast_nodes import *
 from .symbol_table import SymbolTable, Symbol, SymbolKind, DataType
 
 
+# Tipos aceptados sin advertencia en cada contexto
+_CONDITION_TYPES = frozenset({DataType.BOOLEAN, DataType.UNKNOWN, DataType.ERROR})
+_BOOLEAN_TYPES = frozenset({DataType.BOOLEAN, DataType.UNKNOWN})
+_NUMERIC_TYPES = frozenset({DataType.NUMBER, DataType.UNKNOWN})
+
+# Clases de operadores
+_COMPARISON_OPS = frozenset({'<', '<=', '>', '>=', '==', '!=', '===', '!=='})
+_ARITHMETIC_OPS = frozenset({'+', '-', '*', '/', '%'})
+_LOGICAL_OPS = frozenset({'&&', '||'})
+_SIGN_OPS = frozenset({'-', '+'})
+
+
 class SemanticError(Exception):
     """Error de análisis semántico"""
     def __init__(self, line: int, col: int, message: str):
@@ -20,6 +32,13 @@ class SemanticError(Exception):
         super().__init__(f"Error semántico en línea {line}, columna {col}: {message}")
 
 
+class SemanticIssue(NamedTuple):
+    """Error o advertencia registrado durante el análisis (se formatea en get_report)"""
+    line: int
+    col: int
+    message: str
+
+
 class SemanticAnalyzer:
     """
     Analizador semántico que recorre el AST y verifica:
@@ -32,12 +51,37 @@ class SemanticAnalyzer:
     
     def __init__(self):
         self.symbol_table = SymbolTable()
-        self.errors: List[SemanticError] = []
-        self.warnings: List[str] = []
+        self.errors: List[SemanticIssue] = []
+        self.warnings: List[SemanticIssue] = []
         self.in_function = False
         self.current_function_return_type = None
         self.in_class = False
 
+        # Tablas de despacho por tipo exacto de nodo (la jerarquía del AST es plana)
+        self._statement_visitors = {
+            VarDecl: self.visit_var_decl,
+            FunctionDecl: self.visit_function_decl,
+            ClassDecl: self.visit_class_decl,
+            IfStmt: self.visit_if_stmt,
+            WhileStmt: self.visit_while_stmt,
+            ForStmt: self.visit_for_stmt,
+            ReturnStmt: self.visit_return_stmt,
+            ThrowStmt: self.visit_throw_stmt,
+            Block: self.visit_block,
+            ExprStmt: self.visit_expr_stmt,
+        }
+        self._expression_visitors = {
+            BinaryOp: self.visit_binary_op,
+            UnaryOp: self.visit_unary_op,
+            Assignment: self.visit_assignment,
+            CallExpr: self.visit_call_expr,
+            NewExpr: self.visit_new_expr,
+            IndexExpr: self.visit_index_expr,
+            MemberExpr: self.visit_member_expr,
+            Identifier: self.visit_identifier,
+            Literal: self.visit_literal,
+        }
+
     def analyze(self, program: Program) -> bool:
         """
         Analiza el programa y retorna True si no hay errores.
@@ -45,26 +89,22 @@ class SemanticAnalyzer:
         """
         self.errors = []
         self.warnings = []
+        self.symbol_table.reset()
 
-        try:
-            self.visit_program(program)
-
-            # Verificar variables no usadas
-            self._check_unused_symbols()
+        self.visit_program(program)
 
-            return len(self.errors) == 0
+        # Verificar variables no usadas
+        self._check_unused_symbols()
 
-        except Exception as e:
-            self.errors.append(SemanticError(0, 0, f"Error interno: {str(e)}"))
-            return False
+        return len(self.errors) == 0
 
     def _add_error(self, line: int, col: int, message: str):
         """Agrega un error semántico"""
-        self.errors.append(SemanticError(line, col, message))
+        self.errors.append(SemanticIssue(line, col, message))
 
     def _add_warning(self, line: int, col: int, message: str):
         """Agrega un warning"""
-        self.warnings.append(f"Warning línea {line}, col {col}: {message}")
+        self.warnings.append(SemanticIssue(line, col, message))
 
     def _check_unused_symbols(self):
         """Verifica símbolos no usados y genera warnings"""
@@ -86,26 +126,9 @@ class SemanticAnalyzer:
 
     def visit_statement(self, node: ASTNode):
         """Dispatcher para diferentes tipos de sentencias"""
-        if isinstance(node, VarDecl):
-            self.visit_var_decl(node)
-        elif isinstance(node, FunctionDecl):
-            self.visit_function_decl(node)
-        elif isinstance(node, ClassDecl):
-            self.visit_class_decl(node)
-        elif isinstance(node, IfStmt):
-            self.visit_if_stmt(node)
-        elif isinstance(node, WhileStmt):
-            self.visit_while_stmt(node)
-        elif isinstance(node, ForStmt):
-            self.visit_for_stmt(node)
-        elif isinstance(node, ReturnStmt):
-            self.visit_return_stmt(node)
-        elif isinstance(node, ThrowStmt):
-            self.visit_throw_stmt(node)
-        elif isinstance(node, Block):
-            self.visit_block(node)
-        elif isinstance(node, ExprStmt):
-            self.visit_expr_stmt(node)
+        visitor = self._statement_visitors.get(type(node))
+        if visitor:
+            visitor(node)
 
     def visit_var_decl(self, node: VarDecl):
         """Visita declaración de variable"""
@@ -137,7 +160,7 @@ class SemanticAnalyzer:
         self.symbol_table.define(symbol)
 
         # const debe tener inicialización
-        if kind == SymbolKind.CONSTANT and not node.init:
+        if kind is SymbolKind.CONSTANT and not node.init:
             self._add_error(
                 node.line, node.col,
                 f"Constante '{node.name}' debe ser inicializada"
@@ -155,6 +178,7 @@ class SemanticAnalyzer:
             return
 
         # Crear símbolo de función
+        param_types = (DataType.UNKNOWN,) * len(node.params)
         symbol = Symbol(
             name=node.name,
             kind=SymbolKind.FUNCTION,
@@ -162,7 +186,7 @@ class SemanticAnalyzer:
             line=node.line,
             col=node.col,
             initialized=True,
-            param_types=[DataType.UNKNOWN] * len(node.params),
+            param_types=param_types,
             return_type=DataType.UNKNOWN
         )
 
@@ -244,25 +268,21 @@ class SemanticAnalyzer:
         """Visita sentencia if"""
         # Verificar condición
         cond_type = self.visit_expression(node.condition)
-        if cond_type not in [DataType.BOOLEAN, DataType.UNKNOWN, DataType.ERROR]:
+        if cond_type not in _CONDITION_TYPES:
             self._add_warning(
                 node.line, node.col,
                 f"Condición de 'if' debería ser booleana, se encontró {cond_type.value}"
             )
 
-        # Visitar ramas
+        # Visitar ramas (un bloque abre un único scope con el nombre de la rama)
         if isinstance(node.then_branch, Block):
-            self.symbol_table.enter_scope("if_then")
-            self.visit_statement(node.then_branch)
-            self.symbol_table.exit_scope()
+            self.visit_block(node.then_branch, "if_then")
         else:
             self.visit_statement(node.then_branch)
 
         if node.else_branch:
             if isinstance(node.else_branch, Block):
-                self.symbol_table.enter_scope("if_else")
-                self.visit_statement(node.else_branch)
-                self.symbol_table.exit_scope()
+                self.visit_block(node.else_branch, "if_else")
             else:
                 self.visit_statement(node.else_branch)
 
@@ -270,7 +290,7 @@ class SemanticAnalyzer:
         """Visita sentencia while"""
         # Verificar condición
         cond_type = self.visit_expression(node.condition)
-        if cond_type not in [DataType.BOOLEAN, DataType.UNKNOWN, DataType.ERROR]:
+        if cond_type not in _CONDITION_TYPES:
             self._add_warning(
                 node.line, node.col,
                 f"Condición de 'while' debería ser booleana, se encontró {cond_type.value}"
@@ -278,9 +298,7 @@ class SemanticAnalyzer:
 
         # Visitar cuerpo
         if isinstance(node.body, Block):
-            self.symbol_table.enter_scope("while")
-            self.visit_statement(node.body)
-            self.symbol_table.exit_scope()
+            self.visit_block(node.body, "while")
         else:
             self.visit_statement(node.body)
 
@@ -298,7 +316,7 @@ class SemanticAnalyzer:
         # Condition
         if node.condition:
             cond_type = self.visit_expression(node.condition)
-            if cond_type not in [DataType.BOOLEAN, DataType.UNKNOWN, DataType.ERROR]:
+            if cond_type not in _CONDITION_TYPES:
                 self._add_warning(
                     node.line, node.col,
                     f"Condición de 'for' debería ser booleana"
@@ -324,9 +342,9 @@ class SemanticAnalyzer:
         if node.value:
             self.visit_expression(node.value)
 
-    def visit_block(self, node: Block):
+    def visit_block(self, node: Block, scope_name: str = "block"):
         """Visita bloque"""
-        self.symbol_table.enter_scope("block")
+        self.symbol_table.enter_scope(scope_name)
         for stmt in node.statements:
             self.visit_statement(stmt)
         self.symbol_table.exit_scope()
@@ -341,26 +359,10 @@ class SemanticAnalyzer:
 
     def visit_expression(self, node: ASTNode) -> DataType:
         """Visita una expresión y retorna su tipo"""
-        if isinstance(node, BinaryOp):
-            return self.visit_binary_op(node)
-        elif isinstance(node, UnaryOp):
-            return self.visit_unary_op(node)
-        elif isinstance(node, Assignment):
-            return self.visit_assignment(node)
-        elif isinstance(node, CallExpr):
-            return self.visit_call_expr(node)
-        elif isinstance(node, NewExpr):
-            return self.visit_new_expr(node)
-        elif isinstance(node, IndexExpr):
-            return self.visit_index_expr(node)
-        elif isinstance(node, MemberExpr):
-            return self.visit_member_expr(node)
-        elif isinstance(node, Identifier):
-            return self.visit_identifier(node)
-        elif isinstance(node, Literal):
-            return self.visit_literal(node)
-        else:
-            return DataType.UNKNOWN
+        visitor = self._expression_visitors.get(type(node))
+        if visitor:
+            return visitor(node)
+        return DataType.UNKNOWN
 
     def visit_binary_op(self, node: BinaryOp) -> DataType:
         """Visita operación binaria y verifica tipos"""
@@ -369,15 +371,12 @@ class SemanticAnalyzer:
 
         op = node.operator
 
-        # Manejar operador typeof
-        if op in ['===', '!==', '==', '!=']:
-            # Para typeof, el lado derecho puede ser un string literal
-            if isinstance(node.left, UnaryOp) and node.left.operator == 'typeof':
-                return DataType.BOOLEAN
-            # Permitir comparaciones mixtas
+        # Operadores de comparación e igualdad: se permiten comparaciones
+        # mixtas (p. ej. typeof x === "number")
+        if op in _COMPARISON_OPS:
             return DataType.BOOLEAN
         # Operadores aritméticos
-        elif op in ['+', '-', '*', '/', '%']:
+        elif op in _ARITHMETIC_OPS:
             if left_type == DataType.NUMBER and right_type == DataType.NUMBER:
                 return DataType.NUMBER
             elif left_type == DataType.UNKNOWN or right_type == DataType.UNKNOWN:
@@ -390,18 +389,14 @@ class SemanticAnalyzer:
                 )
                 return DataType.ERROR
 
-        # Operadores de comparación
-        elif op in ['<', '<=', '>', '>=', '==', '!=', '===', '!==']:
-            return DataType.BOOLEAN
-
         # Operadores lógicos
-        elif op in ['&&', '||']:
-            if left_type not in [DataType.BOOLEAN, DataType.UNKNOWN]:
+        elif op in _LOGICAL_OPS:
+            if left_type not in _BOOLEAN_TYPES:
                 self._add_warning(
                     node.line, node.col,
                     f"Operando izquierdo de '{op}' debería ser booleano"
                 )
-            if right_type not in [DataType.BOOLEAN, DataType.UNKNOWN]:
+            if right_type not in _BOOLEAN_TYPES:
                 self._add_warning(
                     node.line, node.col,
                     f"Operando derecho de '{op}' debería ser booleano"
@@ -415,15 +410,15 @@ class SemanticAnalyzer:
         operand_type = self.visit_expression(node.operand)
 
         if node.operator == '!':
-            if operand_type not in [DataType.BOOLEAN, DataType.UNKNOWN]:
+            if operand_type not in _BOOLEAN_TYPES:
                 self._add_warning(
                     node.line, node.col,
                     f"Operador '!' requiere operando booleano"
                 )
             return DataType.BOOLEAN
 
-        elif node.operator in ['-', '+']:
-            if operand_type not in [DataType.NUMBER, DataType.UNKNOWN]:
+        elif node.operator in _SIGN_OPS:
+            if operand_type not in _NUMERIC_TYPES:
                 self._add_error(
                     node.line, node.col,
                     f"Operador '{node.operator}' requiere operando numérico"
@@ -448,22 +443,22 @@ class SemanticAnalyzer:
             return DataType.ERROR
 
         # No se puede asignar a constantes
-        if symbol.kind == SymbolKind.CONSTANT:
+        if symbol.kind is SymbolKind.CONSTANT:
             self._add_error(
                 node.line, node.col,
                 f"No se puede reasignar la constante '{node.name}'"
             )
 
         # Marcar como usada e inicializada
-        self.symbol_table.mark_used(node.name)
-        self.symbol_table.mark_initialized(node.name)
+        symbol.used = True
+        symbol.initialized = True
 
         # Verificar tipo del valor
         value_type = self.visit_expression(node.value)
 
         # Verificar compatibilidad de tipos
         if symbol.data_type != DataType.UNKNOWN and value_type != DataType.UNKNOWN:
-            if symbol.data_type != value_type:
+            if symbol.data_type is not value_type:
                 self._add_warning(
                     node.line, node.col,
                     f"Asignación de tipo {value_type.value} a variable de tipo {symbol.data_type.value}"
@@ -488,14 +483,14 @@ class SemanticAnalyzer:
                 )
                 return DataType.ERROR
 
-            if symbol.kind != SymbolKind.FUNCTION:
+            if symbol.kind is not SymbolKind.FUNCTION:
                 self._add_error(
                     node.line, node.col,
                     f"'{node.callee.name}' no es una función"
                 )
                 return DataType.ERROR
 
-            self.symbol_table.mark_used(node.callee.name)
+            symbol.used = True
 
             # Verificar número de argumentos
             if symbol.param_types and len(arg_types) != len(symbol.param_types):
@@ -534,7 +529,7 @@ class SemanticAnalyzer:
         self.visit_expression(node.object)
         index_type = self.visit_expression(node.index)
 
-        if index_type not in [DataType.NUMBER, DataType.UNKNOWN]:
+        if index_type not in _NUMERIC_TYPES:
             self._add_warning(
                 node.line, node.col,
                 "Índice debería ser numérico"
@@ -558,13 +553,13 @@ class SemanticAnalyzer:
             return DataType.ERROR
 
         # Verificar si está inicializada
-        if not symbol.initialized and symbol.kind != SymbolKind.FUNCTION:
+        if not symbol.initialized and symbol.kind is not SymbolKind.FUNCTION:
             self._add_warning(
                 node.line, node.col,
                 f"Variable '{node.name}' puede no estar inicializada"
             )
 
-        self.symbol_table.mark_used(node.name)
+        symbol.used = True
         return symbol.data_type
 
     def visit_literal(self, node: Literal) -> DataType:
@@ -582,31 +577,35 @@ class SemanticAnalyzer:
 
     def get_report(self) -> str:
         """Genera un reporte del análisis semántico"""
-        report = "=" * 60 + "\n"
-        report += "ANÁLISIS SEMÁNTICO\n"
-        report += "=" * 60 + "\n\n"
+        parts: List[str] = [
+            "=" * 60 + "\n",
+            "ANÁLISIS SEMÁNTICO\n",
+            "=" * 60 + "\n\n",
+        ]
 
         # Errores
         if self.errors:
-            report += f"ERRORES ({len(self.errors)}):\n"
-            report += "-" * 60 + "\n"
+            parts.append(f"ERRORES ({len(self.errors)}):\n")
+            parts.append("-" * 60 + "\n")
             for error in self.errors:
-                report += f"  ❌ Línea {error.line}, Col {error.col}: {error.message}\n"
-            report += "\n"
+                parts.append(f"  ❌ Línea {error.line}, Col {error.col}: {error.message}\n")
+            parts.append("\n")
         else:
-            report += "✅ No se encontraron errores semánticos\n\n"
+            parts.append("✅ No se encontraron errores semánticos\n\n")
 
         # Warnings
         if self.warnings:
-            report += f"ADVERTENCIAS ({len(self.warnings)}):\n"
-            report += "-" * 60 + "\n"
+            parts.append(f"ADVERTENCIAS ({len(self.warnings)}):\n")
+            parts.append("-" * 60 + "\n")
             for warning in self.warnings:
-                report += f"  ⚠️  {warning}\n"
-            report += "\n"
+                parts.append(
+                    f"  ⚠️  Warning línea {warning.line}, col {warning.col}: {warning.message}\n"
+                )
+            parts.append("\n")
 
         # Tabla de símbolos
-        report += "TABLA DE SÍMBOLOS:\n"
-        report += "-" * 60 + "\n"
-        report += self.symbol_table.print_tree()
+        parts.append("TABLA DE SÍMBOLOS:\n")
+        parts.append("-" * 60 + "\n")
+        parts.append(self.symbol_table.print_tree())
 
-        return report
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
@@ -2,7 +2,8 @@
 Tabla de Símbolos para el Análisis Semántico
 Maneja scopes, declaraciones de variables y funciones
 """
-from typing import Dict, List, Optional, Set
+import copy
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
@@ -38,49 +39,105 @@ class Symbol:
     used: bool = False
     scope_level: int = 0
     # Para funciones
-    param_types: Optional[List[DataType]] = None
+    param_types: Optional[Tuple[DataType, ...]] = None
     return_type: Optional[DataType] = None
 
 
+# Máximo de símbolos que un scope guarda en lista antes de pasar a diccionario
+_SMALL_SCOPE_LIMIT = 4
+
+
 class Scope:
     """Representa un ámbito (scope) en el programa"""
     
+    __slots__ = ("name", "level", "parent", "symbols", "_small", "children")
+    
     def __init__(self, name: str, level: int, parent: Optional['Scope'] = None):
         self.name = name
         self.level = level
         self.parent = parent
-        self.symbols: Dict[str, Symbol] = {}
+        # La mayoría de los bloques declaran pocos símbolos: se guardan en una
+        # lista plana y solo se crea el diccionario al superar el límite
+        self._small: Optional[List[Symbol]] = []
+        self.symbols: Optional[Dict[str, Symbol]] = None
         self.children: List['Scope'] = []
     
+    def clear(self):
+        """Elimina todos los símbolos de este scope"""
+        self._small = []
+        self.symbols = None
+    
     def define(self, symbol: Symbol) -> bool:
         """
         Define un símbolo en este scope.
         Retorna False si ya existe en este scope.
         """
-        if symbol.name in self.symbols:
+        if self.lookup_local(symbol.name) is not None:
             return False
-        self.symbols[symbol.name] = symbol
+        small = self._small
+        if small is None:
+            self.symbols[symbol.name] = symbol
+        elif len(small) < _SMALL_SCOPE_LIMIT:
+            small.append(symbol)
+        else:
+            self.symbols = {s.name: s for s in small}
+            self.symbols[symbol.name] = symbol
+            self._small = None
         return True
     
     def lookup_local(self, name: str) -> Optional[Symbol]:
         """Busca un símbolo solo en este scope"""
-        return self.symbols.get(name)
+        small = self._small
+        if small is None:
+            return self.symbols.get(name)
+        for symbol in small:
+            if symbol.name == name:
+                return symbol
+        return None
     
     def lookup(self, name: str) -> Optional[Symbol]:
         """Busca un símbolo en este scope y en los padres"""
-        symbol = self.lookup_local(name)
-        if symbol:
-            return symbol
-        if self.parent:
-            return self.parent.lookup(name)
+        scope = self
+        while scope is not None:
+            symbol = scope.lookup_local(name)
+            if symbol:
+                return symbol
+            scope = scope.parent
         return None
     
     def get_all_symbols(self) -> List[Symbol]:
         """Retorna todos los símbolos en este scope"""
+        if self._small is not None:
+            return list(self._small)
         return list(self.symbols.values())
     
     def __repr__(self) -> str:
-        return f"Scope({self.name}, level={self.level}, symbols={len(self.symbols)})"
+        return f"Scope({self.name}, level={self.level}, symbols={len(self.get_all_symbols())})"
+
+
+# Funciones y constantes built-in, construidas una sola vez al importar
+_BUILTIN_SYMBOLS = tuple(
+    Symbol(
+        name=name,
+        kind=SymbolKind.FUNCTION,
+        data_type=DataType.FUNCTION,
+        line=0,
+        col=0,
+        initialized=True,
+        used=False,
+        param_types=params,
+        return_type=return_type
+    )
+    for name, params, return_type in [
+        ("print", (DataType.UNKNOWN,), DataType.VOID),
+        ("console", (), DataType.UNKNOWN),  # Objeto console
+        ("log", (DataType.UNKNOWN,), DataType.VOID),  # console.log
+        ("error", (DataType.UNKNOWN,), DataType.VOID),  # console.error
+        ("input", (), DataType.STRING),
+        ("parseInt", (DataType.STRING,), DataType.NUMBER),
+        ("parseFloat", (DataType.STRING,), DataType.NUMBER),
+    ]
+)
 
 
 class SymbolTable:
@@ -96,32 +153,20 @@ class SymbolTable:
         
         # Funciones built-in
         self._define_builtins()
+    
+    def reset(self):
+        """Deja la tabla como recién creada para un nuevo análisis"""
+        self.global_scope.children = []
+        self.current_scope = self.global_scope
+        self.scope_counter = 0
+        self._define_builtins()
 
     def _define_builtins(self):
         """Define funciones y constantes built-in"""
-        builtins = [
-            ("print", [DataType.UNKNOWN], DataType.VOID),
-            ("console", [], DataType.UNKNOWN),  # Objeto console
-            ("log", [DataType.UNKNOWN], DataType.VOID),  # console.log
-            ("error", [DataType.UNKNOWN], DataType.VOID),  # console.error
-            ("input", [], DataType.STRING),
-            ("parseInt", [DataType.STRING], DataType.NUMBER),
-            ("parseFloat", [DataType.STRING], DataType.NUMBER),
-        ]
-
-        for name, params, return_type in builtins:
-            symbol = Symbol(
-                name=name,
-                kind=SymbolKind.FUNCTION,
-                data_type=DataType.FUNCTION,
-                line=0,
-                col=0,
-                initialized=True,
-                used=False,
-                param_types=params,
-                return_type=return_type
-            )
-            self.global_scope.define(symbol)
+        # Copia superficial: cada tabla marca `used` en sus propios símbolos
+        self.global_scope.clear()
+        for symbol in _BUILTIN_SYMBOLS:
+            self.global_scope.define(copy.copy(symbol))
     
     def enter_scope(self, name: str) -> Scope:
         """Entra a un nuevo scope (bloque, función, etc.)"""
@@ -170,7 +215,7 @@ class SymbolTable:
     def _collect_unused(self, scope: Scope, unused: List[Symbol]):
         """Recolecta símbolos no usados recursivamente"""
         for symbol in scope.get_all_symbols():
-            if not symbol.used and symbol.kind != SymbolKind.FUNCTION:
+            if not symbol.used and symbol.kind is not SymbolKind.FUNCTION:
                 unused.append(symbol)
         for child in scope.children:
             self._collect_unused(child, unused)
@@ -192,18 +237,24 @@ class SymbolTable:
         if scope is None:
             scope = self.global_scope
         
-        result = "  " * indent + f"{scope.name} (level {scope.level}):\n"
+        parts: List[str] = []
+        self._collect_tree(scope, indent, parts)
+        return "".join(parts)
+    
+    def _collect_tree(self, scope: Scope, indent: int, parts: List[str]):
+        """Agrega recursivamente las líneas del árbol de scopes a parts"""
+        parts.append("  " * indent + f"{scope.name} (level {scope.level}):\n")
         for symbol in scope.get_all_symbols():
             used_mark = "✓" if symbol.used else "✗"
             init_mark = "✓" if symbol.initialized else "✗"
-            result += "  " * (indent + 1)
-            result += f"{symbol.name} [{symbol.kind.value}:{symbol.data_type.value}] "
-            result += f"used:{used_mark} init:{init_mark}\n"
+            parts.append(
+                "  " * (indent + 1)
+                + f"{symbol.name} [{symbol.kind.value}:{symbol.data_type.value}] "
+                + f"used:{used_mark} init:{init_mark}\n"
+            )
         
         for child in scope.children:
-            result += self.print_tree(child, indent + 1)
-        
-        return result
+            self._collect_tree(child, indent + 1, parts)
     
     def __repr__(self) -> str:
         return f"SymbolTable(current_scope={self.current_scope.name})"
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
 NON_TERMINALS = [
     "Program","StmtList","Stmt","Block","VarDecl","VarKind","VarDeclList","VarDeclListTail",
@@ -32,11 +32,26 @@ TOKEN_NAME = {
     "-=":"SUB_ASSIGN","+=":"ADD_ASSIGN","<":"LT","<=":"LE",">":"GT",">=":"GE","||":"OR",
     "&&":"AND","+":"PLUS","-":"MINUS","*":"STAR","/":"SLASH","%":"PERCENT","!":"BANG",
     "${":"TEMPLATE_START","try": "TRY","catch": "CATCH","finally": "FINALLY", "console": "CONSOLE",
-    "?.": "OPTIONAL_CHAINING","??": "NULLISH_COALESCING"
+    "?.": "OPTIONAL_CHAINING","??": "NULLISH_COALESCING","?": "QUESTION"
 }
 
-@dataclass(frozen=True)
-class Token:
+# Operadores agrupados por su primer carácter, del más largo al más corto
+# (máxima coincidencia): primer carácter -> ((lexema, tipo de token), ...)
+OP_BY_FIRST = {}
+for _op in sorted(OPERATORS, key=lambda s:(-len(s), s)):
+    OP_BY_FIRST.setdefault(_op[0], []).append((_op, TOKEN_NAME[_op]))
+OP_BY_FIRST = {ch: tuple(ops) for ch, ops in OP_BY_FIRST.items()}
+del _op
+
+# Caracteres que solo pueden ser un operador de un carácter: carácter -> tipo de token
+SINGLE_CHAR_TOKENS = {
+    ch: ops[0][1] for ch, ops in OP_BY_FIRST.items()
+    if len(ops) == 1 and len(ops[0][0]) == 1
+}
+
+# Inmutable y construido como tupla: sin el coste de __setattr__ por campo
+# de una dataclass congelada, que se paga una vez por token
+class Token(NamedTuple):
     type: str
     lexeme: str
     line: int
@@ -0,0 +1,65 @@
+import pytest
+
+from app.lexer import Lexer
+from app.tokens import LexError
+
+
+def _stream(source):
+    return [(t.type, t.lexeme, t.line, t.col) for t in Lexer(source).tokenize()]
+
+
+def test_question_mark_is_a_token():
+    # Antes "?" estaba en OPERATORS sin nombre en TOKEN_NAME y el lexer lanzaba KeyError
+    tokens = Lexer("a ? b : c").tokenize()
+    assert [(t.type, t.lexeme) for t in tokens] == [
+        ("ID", "a"), ("QUESTION", "?"), ("ID", "b"), ("COLON", ":"), ("ID", "c"), ("EOF", "EOF"),
+    ]
+
+
+def test_multiline_template_with_interpolations():
+    # Solo se emiten los inicios de interpolación; la posición sigue al salto de línea
+    assert _stream("let s = `a ${x}\nb ${y} c`;\nz") == [
+        ("LET", "let", 1, 1), ("ID", "s", 1, 5), ("ASSIGN", "=", 1, 7),
+        ("TEMPLATE_START", "${", 1, 12), ("TEMPLATE_START", "${", 2, 3),
+        ("SEMI", ";", 2, 10), ("ID", "z", 3, 1), ("EOF", "EOF", 3, 2),
+    ]
+
+
+def test_unterminated_template_reports_its_start():
+    with pytest.raises(LexError) as info:
+        Lexer("let s = `abc\n${x}").tokenize()
+    assert (info.value.line, info.value.col, info.value.lexeme) == (1, 9, "Template string no cerrado")
+
+
+def test_crlf_line_endings():
+    assert _stream("let a = 1;\r\nlet b = a\r\n  + 2;\r\n") == [
+        ("LET", "let", 1, 1), ("ID", "a", 1, 5), ("ASSIGN", "=", 1, 7), ("NUM", "1", 1, 9), ("SEMI", ";", 1, 10),
+        ("LET", "let", 2, 1), ("ID", "b", 2, 5), ("ASSIGN", "=", 2, 7), ("ID", "a", 2, 9),
+        ("PLUS", "+", 3, 3), ("NUM", "2", 3, 5), ("SEMI", ";", 3, 6), ("EOF", "EOF", 4, 1),
+    ]
+
+
+def test_comment_runs_spanning_lines_are_skipped():
+    assert _stream("x // uno\n// dos\n\n  // tres\ny") == [
+        ("ID", "x", 1, 1), ("ID", "y", 5, 1), ("EOF", "EOF", 5, 2),
+    ]
+
+
+def test_block_comment_spanning_lines():
+    # El lenguaje no tiene comentarios /* */: se tokenizan como operadores,
+    # pero las posiciones deben seguir el salto de línea del medio
+    assert _stream("a /* uno\n dos */ b") == [
+        ("ID", "a", 1, 1), ("SLASH", "/", 1, 3), ("STAR", "*", 1, 4), ("ID", "uno", 1, 6),
+        ("ID", "dos", 2, 2), ("STAR", "*", 2, 6), ("SLASH", "/", 2, 7), ("ID", "b", 2, 9),
+        ("EOF", "EOF", 2, 10),
+    ]
+
+
+@pytest.mark.parametrize("source, position", [
+    ('x = "abc\ny', (1, 5)),
+    ('ok\n  x = "abc', (2, 7)),
+])
+def test_unterminated_string_position(source, position):
+    with pytest.raises(LexError) as info:
+        Lexer(source).tokenize()
+    assert (info.value.line, info.value.col) == position
@@ -0,0 +1,87 @@
+import json
+import pickle
+
+import pytest
+
+import app.regex_nfa_dfa as regex_nfa_dfa
+from app.regex_nfa_dfa import (DFA, TABLE_WIDTH, _ALPHABET, _accepts_of, build_token_nfa,
+                                epsilon_closure, move)
+
+
+def _token_dfa(minimize):
+    start = build_token_nfa()
+    d = DFA()
+    d.build(start, _ALPHABET)
+    if minimize:
+        d.minimize()
+    return start, d
+
+
+def _assert_matches_nfa(start, d):
+    # Recorre el producto (estado del AFD, subconjunto del NFA): cada estado alcanzable
+    # y cada código ASCII deben llevar al mismo destino y aceptar los mismos tokens
+    first = (d.start, start._ec)
+    seen = {first}
+    work = [first]
+    while work:
+        s, S = work.pop()
+        assert d.accepts[s] == _accepts_of(S)
+        for c in range(TABLE_WIDTH):
+            ch = chr(c)
+            t = d.step(s, ch)
+            T = epsilon_closure(move(S, ch)) if ch in _ALPHABET else frozenset()
+            assert (t >= 0) == bool(T), (s, c)
+            if t >= 0 and (t, T) not in seen:
+                seen.add((t, T))
+                work.append((t, T))
+
+
+def test_table_matches_nfa():
+    _assert_matches_nfa(*_token_dfa(minimize=False))
+
+
+def test_minimized_table_matches_nfa():
+    _assert_matches_nfa(*_token_dfa(minimize=True))
+
+
+def test_transitions_agree_with_step():
+    # transitions() es la vista por carácter que usan to_dot y la exportación HTML
+    _, d = _token_dfa(minimize=True)
+    for s in range(len(d.accepts)):
+        expected = {chr(c): t for c in range(TABLE_WIDTH) if (t := d.step(s, chr(c))) >= 0}
+        assert d.transitions(s) == expected
+
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(regex_nfa_dfa, "_CACHE_DIR", str(tmp_path))
+    _, d = _token_dfa(minimize=True)
+    d.save_cache("k")
+    loaded = DFA.from_cached("k")
+    assert loaded is not None
+    assert loaded.accepts == d.accepts and loaded.start == d.start
+    assert loaded.table == d.table and loaded.row_of == d.row_of and loaded.eqclass == d.eqclass
+
+
+@pytest.mark.parametrize("payload", [
+    b'[0, [[]], [0',  # JSON truncado
+    b'{"start": 0}',  # JSON ajeno
+    pickle.dumps((0, [()], bytes(TABLE_WIDTH), 1, [0], [-1])),  # caché antigua en pickle
+    json.dumps([0, [[]], [0] * TABLE_WIDTH, 1, [5], [-1]]).encode(),  # fila fuera de la tabla
+    json.dumps([0, [[]], [0] * TABLE_WIDTH, 1, [0], [7]]).encode(),  # destino inexistente
+    json.dumps([0, [[1]], [0] * TABLE_WIDTH, 1, [0], [-1]]).encode(),  # token que no es str
+    json.dumps([0, ["ID"], [0] * TABLE_WIDTH, 1, [0], [-1]]).encode(),  # aceptación que no es lista
+    json.dumps([0, [[]], [0.5] * TABLE_WIDTH, 1, [0], [-1]]).encode(),  # clase no entera
+])
+def test_bad_cache_falls_back(tmp_path, monkeypatch, payload):
+    monkeypatch.setattr(regex_nfa_dfa, "_CACHE_DIR", str(tmp_path))
+    (tmp_path / "dfa_k.json").write_bytes(payload)
+    assert DFA.from_cached("k") is None
+
+
+def test_cache_key_tracks_module_source(monkeypatch, tmp_path):
+    # Editar regex_nfa_dfa.py debe invalidar la caché sin subir _CACHE_VERSION a mano
+    before = regex_nfa_dfa._cache_key()
+    copy = tmp_path / "regex_nfa_dfa.py"
+    copy.write_bytes(open(regex_nfa_dfa.__file__, "rb").read() + b"\n# cambio\n")
+    monkeypatch.setattr(regex_nfa_dfa, "__file__", str(copy))
+    assert regex_nfa_dfa._cache_key() != before
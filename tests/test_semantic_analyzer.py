@@ -0,0 +1,64 @@
+from app.lexer import Lexer
+from app.parser import Parser
+from app.semantic_analyzer import SemanticAnalyzer
+
+
+SOURCE = """
+let total = 0;
+let sinUso = 1;
+function suma(a, b) {
+    let parcial = a + b;
+    return parcial;
+}
+total = suma(1, 2);
+noDeclarada = 3;
+"""
+
+
+def _parse(source):
+    return Parser(Lexer(source).tokenize()).parse()
+
+
+def test_reanalysis_with_same_analyzer_is_stable():
+    ast = _parse(SOURCE)
+    analyzer = SemanticAnalyzer()
+    first = (analyzer.analyze(ast), list(analyzer.errors), list(analyzer.warnings), analyzer.get_report())
+    second = (analyzer.analyze(ast), list(analyzer.errors), list(analyzer.warnings), analyzer.get_report())
+    assert first == second
+    assert first[1] and first[2]  # el programa tiene errores y advertencias que repetir
+
+
+def _scope_tree(scope):
+    for child in scope.children:
+        assert child.parent is scope and child.level == scope.level + 1
+    names = sorted(symbol.name for symbol in scope.get_all_symbols())
+    return (scope.name, names, [_scope_tree(child) for child in scope.children])
+
+
+def test_scope_tree_for_nested_functions_and_blocks():
+    # Cada rama con llaves abre un único scope con el nombre de la rama
+    source = """
+function externa(n) {
+    let x = n;
+    if (x > 0) { let y = 1; } else { let z = 2; }
+    while (x > 0) { x = x - 1; }
+    function interna(m) { { let w = m; } }
+}
+externa(3);
+"""
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(_parse(source))
+    table = analyzer.symbol_table
+    assert table.current_scope is table.global_scope
+    name, _, children = _scope_tree(table.global_scope)
+    assert name == "global"
+    assert children == [
+        ("function_externa", ["interna", "n", "x"], [
+            ("if_then", ["y"], []),
+            ("if_else", ["z"], []),
+            ("while", [], []),
+            ("function_interna", ["m"], [
+                ("block", ["w"], []),
+            ]),
+        ]),
+    ]